@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from functools import partial
 
 from fastapi import APIRouter, FastAPI, HTTPException
 from dotenv import load_dotenv
@@ -65,7 +66,7 @@ except Exception as exc:
     logger.warning("llm_pk_init_failed", error=str(exc))
 pk_extractor = PKExtractor(
     llm_client=_llm,
-    pmc_fetcher=fetch_pmc_sections if _llm else None,
+    pmc_fetcher=partial(fetch_pmc_sections, cache=pubmed_client.cache, api_key=config.ncbi_api_key) if _llm else None,
     llm_extractor=_llm_pk,
 )
 validator = PKValidator("backend/rules/validation_rules.yaml")
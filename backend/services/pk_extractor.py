@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import math
 import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Dict, List, Tuple
 
 from backend.schemas import CIValue, Evidence, PKValue
@@ -10,6 +16,214 @@ from backend.services.pmc_fetcher import (
     _TABLE_ROW_WITH_CI_AND_CV,
 )
 
+# Metric -> (label alternation, unit alternation); a None unit means a literal, uncaptured "%".
+_METRIC_REGEX_PARTS: Dict[str, Tuple[str, str | None]] = {
+    "Cmax": (r"C\s*max|C_max", r"ng/mL|mg/L|µg/L|ug/L|ng/L|mg/mL|µg/mL|ug/mL"),
+    # Possessive: the unit run ends the pattern, so giving characters back can never help a match.
+    "AUC": (r"AUC(?:0-?t|0-?inf|0-?∞)?", r"[a-zA-Zµμ/\*\-\.]++"),
+    "t1/2": (r"t\s*1\s*/\s*2|half\s*-?life", r"h|hr|hours"),
+    "Tmax": (r"T\s*max|T_max", r"h|hr|hours|min"),
+    "CVintra": (r"intra[^\d]{0,20}CV|CV[^\d]{0,20}intra|CV[^\d]{0,20}within", None),
+    "lambda_z": (r"lambda[_\s-]*z|z[_\s-]*lambda|elimination\s*rate\s*constant", r"1/h|h\^-1|hr\^-1"),
+}
+
+
+def _metric_regex(label: str, unit: str | None, name: str | None = None) -> str:
+    """`<label> [=|:] <value> <unit>` pattern; with a name the groups become <name>_label/_value/_unit."""
+
+    def group(part: str, body: str) -> str:
+        return f"(?P<{name}_{part}>{body})" if name else f"({body})"
+
+    unit_part = group("unit", unit) if unit is not None else "%"
+    return group("label", label) + r"\s*(?:=|:)?\s*" + group("value", r"\d+(?:\.\d+)?") + r"\s*" + unit_part
+
+
+# Compiled once at import; PKExtractor instances share them.
+_METRIC_PATTERNS: Dict[str, re.Pattern[str]] = {
+    metric: re.compile(_metric_regex(label, unit), re.IGNORECASE)
+    for metric, (label, unit) in _METRIC_REGEX_PARTS.items()
+}
+# The run after "CI" is atomic: it only gives back non-digits, so the low bound could never start
+# before the point where the greedy run stops.
+_CI_RE = re.compile(
+    r"(?P<cl>90|95)\s*%?\s*CI(?>[^\d]{0,10})\(?\s*(?P<low>\d+(?:\.\d+)?)\s*%?\s*(?:-|–|to|,|;)\s*(?P<high>\d+(?:\.\d+)?)\s*%?",
+    re.IGNORECASE,
+)
+_GMR_RE = re.compile(
+    r"(GMR|geometric\s*mean\s*ratio|T\s*/\s*R|test\s*/\s*reference|test-to-reference)\s*(?:=|:)?\s*(\d+(?:\.\d+)?)",
+    re.IGNORECASE,
+)
+_N_RE = re.compile(r"\b(n|N)\s*=?\s*(\d{2,4})\b")
+
+# Joins texts for _METRIC_SCAN. NUL is neither whitespace, a digit, nor in any label/unit class, and the
+# digit stops the [^\d]{0,20} runs in the CVintra labels, so no metric match can span two texts.
+_SCAN_SEPARATOR = "\x00" + "0" + "\x00"
+
+# All metric patterns fused into one scan. Each alternative sits in a lookahead so hits never consume
+# text; no two labels can match at the same offset, and the leading class (first letters of every
+# label) lets the engine skip other positions cheaply.
+_METRIC_GROUPS = {metric: f"m{i}" for i, metric in enumerate(_METRIC_REGEX_PARTS)}
+_GROUP_METRICS = {group: metric for metric, group in _METRIC_GROUPS.items()}
+_METRIC_SCAN = re.compile(
+    "(?=[acehiltz])(?="
+    + "|".join(
+        f"(?P<{group}>{_metric_regex(*_METRIC_REGEX_PARTS[metric], name=group)})"
+        for metric, group in _METRIC_GROUPS.items()
+    )
+    + ")",
+    re.IGNORECASE,
+)
+
+# Design keywords, matched on lowered text. "2x2"/"2×2"/"crossover" back the 2x2_crossover hint, the
+# wider crossover flag also accepts "cross-over"; "log" and "transform" only count together.
+_DESIGN_TERM_RE = re.compile(
+    r"(?=(?P<crossover>2x2|2×2|crossover)|(?P<cross_over>cross-over)|(?P<log>log(?P<log_scale>-scale)?)|(?P<transform>transform))"
+)
+_DESIGN_TERM_COUNT = len(_DESIGN_TERM_RE.groupindex)
+
+# Cheap guard for the metric regexes: every PKExtractor.patterns entry needs one of these keywords.
+_PK_METRIC_HINT = re.compile(
+    r"c\s*max|c_max|auc|t\s*1\s*/\s*2|half\s*-?life|t\s*max|t_max|cv|lambda|elimination\s*rate\s*constant",
+    re.IGNORECASE,
+)
+
+# Metrics reported as missing when no source yields them; any AUC variant satisfies "AUC".
+_REQUIRED_METRICS = ("Cmax", "AUC", "t1/2", "CVintra")
+_AUC_METRICS = frozenset({"AUC", "AUC0-inf", "AUC0-t"})
+
+# Any mention of intra-subject variability; gates the PMC LLM fallback.
+_CV_HINT_RE = re.compile(
+    r"\bCV|coefficient\s+of\s+variation|intra[-_\s]*(?:subject|individual)|within[-_\s]*subject",
+    re.IGNORECASE,
+)
+
+# Concurrent llm_extractor requests per extract() call.
+_LLM_MAX_WORKERS = 4
+
+_DIGITS_RE = re.compile(r"\d+")
+
+# Numbers directly followed by a percent sign (used to tell percent CIs from ratio CIs).
+_PERCENT_NUMBER = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+
+# Context tag -> trigger terms (matched as substrings of the lowered snippet).
+_CONTEXT_TAG_TERMS: Dict[str, Tuple[str, ...]] = {
+    "fasted": ("fasted", "fasting", "overnight fast", "empty stomach"),
+    "fed": ("fed", "high-fat meal", "high fat meal", "standard meal", "after meal", "postprandial"),
+    "human": ("subject", "volunteer", "patient", "human"),
+    "animal": ("rat", "dog", "rabbit", "animal", "mouse"),
+    "crossover": ("crossover", "cross-over", "2x2", "2×2"),
+    "log_transformed": ("log-transformed", "ln(", "log-scale"),
+}
+
+
+def _tag_alternation(tags: Tuple[str, ...]) -> re.Pattern[str]:
+    # Zero-width lookahead so a hit never consumes text another tag's term could start in.
+    groups = "|".join(
+        f"(?P<{tag}>{'|'.join(re.escape(term) for term in _CONTEXT_TAG_TERMS[tag])})" for tag in tags
+    )
+    return re.compile(f"(?=(?:{groups}))")
+
+
+# One scan over the snippet instead of one substring pass per tag.
+_CONTEXT_TAG_RE = _tag_alternation(tuple(_CONTEXT_TAG_TERMS))
+# Context tags are tracked as an int bitmask; Evidence.context_tags still gets the dict form.
+_TAG_BITS = {tag: 1 << i for i, tag in enumerate(_CONTEXT_TAG_TERMS)}
+_ALL_TAGS = (1 << len(_TAG_BITS)) - 1
+_TAG_FASTED, _TAG_FED, _TAG_HUMAN, _TAG_ANIMAL, _TAG_CROSSOVER, _TAG_LOG_TRANSFORMED = _TAG_BITS.values()
+_FEEDING_RE = _tag_alternation(("fasted", "fed"))
+
+
+def _value_bucket(value: float) -> int | None:
+    """Integer bucket of value at 1e-6 resolution; None when the scaled value is not finite."""
+    scaled = value * 1_000_000
+    return round(scaled) if math.isfinite(scaled) else None
+
+
+def _construct_evidence(**fields: Any) -> Evidence:
+    """Build Evidence from fields we assembled ourselves, skipping validation when it would be a no-op.
+
+    Evidence._coerce_legacy fills source_id/pmid_or_url, derives url/pmid from pmid_or_url, and maps
+    the legacy snippet/context/source fields; any payload it would change goes through the full
+    constructor.
+    """
+    if _evidence_is_canonical(fields):
+        return Evidence.model_construct(**fields)
+    return Evidence(**fields)
+
+
+def _evidence_is_canonical(fields: Dict[str, Any]) -> bool:
+    """True if Evidence._coerce_legacy would leave these fields unchanged."""
+    pmid_or_url = fields.get("pmid_or_url")
+    if not fields.get("source_id") or not isinstance(pmid_or_url, str) or not pmid_or_url:
+        return False
+    if fields.get("snippet") or fields.get("context") or fields.get("source"):
+        return False
+    if not fields.get("url") and pmid_or_url.startswith("http"):
+        return False
+    if not fields.get("pmid") and (pmid_or_url.isdigit() or pmid_or_url.startswith("PMID:")):
+        return False
+    return True
+
+
+@dataclass
+class _MetricConflicts:
+    """Regex PK values of one metric: value range, (index, source label) entries and sorted distinct labels."""
+
+    first: float
+    low: float
+    high: float
+    entries: List[Tuple[int, str]] = field(default_factory=list)
+    labels: List[str] = field(default_factory=list)
+
+    def add(self, value: float, idx: int, label: str) -> None:
+        self.low = min(self.low, value)
+        self.high = max(self.high, value)
+        self.entries.append((idx, label))
+        pos = bisect_left(self.labels, label)
+        if pos == len(self.labels) or self.labels[pos] != label:
+            self.labels.insert(pos, label)
+
+    def labels_with(self, label: str) -> List[str]:
+        """Sorted distinct labels plus label, as a new list."""
+        labels = list(self.labels)
+        pos = bisect_left(labels, label)
+        if pos == len(labels) or labels[pos] != label:
+            labels.insert(pos, label)
+        return labels
+
+
+@lru_cache(maxsize=4096)
+def _format_source_id(source_id: str) -> str:
+    """Source label used in conflict warnings (PMID:<id>, PMC article URL, or the URL itself)."""
+    if source_id.startswith("http"):
+        return source_id
+    if source_id.startswith("PMID:"):
+        return source_id
+    if source_id.startswith("PMCID:"):
+        pmc_id = source_id.replace("PMCID:", "")
+        if pmc_id and not pmc_id.upper().startswith("PMC"):
+            pmc_id = f"PMC{pmc_id}"
+        return f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmc_id}/"
+    return f"PMID:{source_id}"
+
+
+@lru_cache(maxsize=4096)
+def _pmc_url(source_id: str) -> str:
+    """PMC article URL built from the first digit run of source_id ("" when there is none)."""
+    match = _DIGITS_RE.search(source_id)
+    if not match:
+        return ""
+    pmc_id = match.group(0)
+    if not pmc_id.upper().startswith("PMC"):
+        pmc_id = f"PMC{pmc_id}"
+    return f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmc_id}/"
+
+
+@lru_cache(maxsize=256)
+def _normalize_abstract(text: str) -> str:
+    """normalize_space memoized for abstracts: /extract_pk and /run_pipeline re-send the same ones."""
+    return normalize_space(text)
+
 
 def _is_valid_evidence_url(url: Any) -> bool:
     """Evidence is kept only if pmid_or_url starts with PMID:, PMCID:, or http."""
@@ -78,47 +292,18 @@ _normalize_llm_pk_response = normalize_llm_payload
 
 
 class PKExtractor:
-    def __init__(self, llm_client=None, pmc_fetcher=None, llm_extractor=None) -> None:
+    def __init__(self, llm_client=None, pmc_fetcher=None, llm_extractor=None, first_match_only: bool = False) -> None:
         self.llm_client = llm_client
         self.pmc_fetcher = pmc_fetcher
         self.llm_extractor = llm_extractor
+        # Keep only the first regex match per metric pattern and abstract (skips the rest of the scan).
+        self.first_match_only = first_match_only
         self.last_context: Dict[str, Any] = {}
         self.last_warnings: List[str] = []
-        self.patterns = {
-            "Cmax": re.compile(
-                r"(C\s*max|C_max)\s*(?:=|:)?\s*(\d+(?:\.\d+)?)\s*(ng/mL|mg/L|µg/L|ug/L|ng/L|mg/mL|µg/mL|ug/mL)",
-                re.IGNORECASE,
-            ),
-            "AUC": re.compile(
-                r"(AUC(?:0-?t|0-?inf|0-?∞)?)\s*(?:=|:)?\s*(\d+(?:\.\d+)?)\s*([a-zA-Zµμ/\*\-\.]+)",
-                re.IGNORECASE,
-            ),
-            "t1/2": re.compile(
-                r"(t\s*1\s*/\s*2|half\s*-?life)\s*(?:=|:)?\s*(\d+(?:\.\d+)?)\s*(h|hr|hours)",
-                re.IGNORECASE,
-            ),
-            "Tmax": re.compile(
-                r"(T\s*max|T_max)\s*(?:=|:)?\s*(\d+(?:\.\d+)?)\s*(h|hr|hours|min)",
-                re.IGNORECASE,
-            ),
-            "CVintra": re.compile(
-                r"(intra[^\d]{0,20}CV|CV[^\d]{0,20}intra|CV[^\d]{0,20}within)\s*(?:=|:)?\s*(\d+(?:\.\d+)?)\s*%",
-                re.IGNORECASE,
-            ),
-            "lambda_z": re.compile(
-                r"(lambda[_\s-]*z|z[_\s-]*lambda|elimination\s*rate\s*constant)\s*(?:=|:)?\s*(\d+(?:\.\d+)?)\s*(1/h|h\^-1|hr\^-1)",
-                re.IGNORECASE,
-            ),
-        }
-        self.ci_pattern = re.compile(
-            r"(?P<cl>90|95)\s*%?\s*CI[^\d]{0,10}\(?\s*(?P<low>\d+(?:\.\d+)?)\s*%?\s*(?:-|–|to|,|;)\s*(?P<high>\d+(?:\.\d+)?)\s*%?",
-            re.IGNORECASE,
-        )
-        self.gmr_pattern = re.compile(
-            r"(GMR|geometric\s*mean\s*ratio|T\s*/\s*R|test\s*/\s*reference|test-to-reference)\s*(?:=|:)?\s*(\d+(?:\.\d+)?)",
-            re.IGNORECASE,
-        )
-        self.n_pattern = re.compile(r"\b(n|N)\s*=?\s*(\d{2,4})\b")
+        self.patterns = _METRIC_PATTERNS
+        self.ci_pattern = _CI_RE
+        self.gmr_pattern = _GMR_RE
+        self.n_pattern = _N_RE
 
     def extract(self, abstracts: Dict[str, str], inn: str | None = None) -> Tuple[List[PKValue], List[CIValue], List[str]]:
         """Extract PK/CI values collecting all matches, annotating conflicts with sources, and expanding/context-tagging snippets.
@@ -128,7 +313,9 @@ class PKExtractor:
         """
         pk_values: List[PKValue] = []
         ci_values: List[CIValue] = []
-        found_metrics = set()
+        found_metrics: set[str] = set()
+        # Regex PK values seen so far per metric, for cross-source conflict detection.
+        metric_conflicts: Dict[str, _MetricConflicts] = {}
 
         self.last_context = {"study_condition": "unknown", "meal_details": None, "design_hints": None}
         self.last_warnings = []
@@ -137,11 +324,25 @@ class PKExtractor:
         design_hints: Dict[str, Any] = {"is_crossover_2x2": None, "log_transform": None, "n": None}
         ambiguous_sources: set[str] = set()
 
+        # Normalize each abstract once; the regex and LLM passes share the cleaned text.
+        normalized: Dict[str, str] = {}
         for source_id, text in abstracts.items():
-            clean_text = normalize_space(text)
-            if not clean_text:
-                continue
-            condition, meal_candidate, fed_detected, fasted_detected, conflict = self._infer_study_condition(clean_text)
+            clean_text = _normalize_abstract(text)
+            if clean_text:
+                normalized[source_id] = clean_text
+
+        # One metric scan over every abstract that mentions a PK keyword.
+        metric_hits = self._scan_metrics(
+            {source_id: clean_text for source_id, clean_text in normalized.items() if _PK_METRIC_HINT.search(clean_text)},
+            first_match_only=self.first_match_only,
+        )
+
+        for source_id, clean_text in normalized.items():
+            clean_lower = clean_text.lower()
+            # lower() only ever lengthens text (e.g. "İ"); when the length is unchanged, offsets line up and
+            # keyword checks can run on clean_lower[left:right] without copying the snippet.
+            lower_aligned = len(clean_lower) == len(clean_text)
+            condition, meal_candidate, fed_detected, fasted_detected, conflict = self._infer_study_condition(clean_lower)
             if fed_detected:
                 study_flags["fed"] = True
             if fasted_detected:
@@ -150,110 +351,126 @@ class PKExtractor:
                 meal_details = self._merge_meal_details(meal_details, meal_candidate)
             if conflict:
                 ambiguous_sources.add(source_id)
+            ambiguous = source_id in ambiguous_sources
 
-            design_hints = self._merge_design_hints(design_hints, self._infer_design_hints(clean_text))
-            design_hint = self._infer_design_hint(clean_text)
+            design_terms = self._design_terms(clean_lower)
+            design_hints = self._merge_design_hints(design_hints, self._infer_design_hints(clean_text, design_terms))
+            design_hint = self._infer_design_hint(clean_text, design_terms)
             per_source_metrics: Dict[str, List[Tuple[float, int]]] = {}
             # Regex-based extraction from abstracts (MVP).
-            for metric, pattern in self.patterns.items():
-                for match in pattern.finditer(clean_text):
-                    value = safe_float(match.group(2))
-                    unit = match.group(3) if match.lastindex and match.lastindex >= 3 else "%"
-                    if value is None:
-                        continue
-                    metric_name = metric
-                    if metric == "AUC":
-                        label = (match.group(1) or "").lower()
-                        if "inf" in label or "∞" in label:
-                            metric_name = "AUC0-inf"
-                        elif "0-t" in label or "0t" in label:
-                            metric_name = "AUC0-t"
-                        else:
-                            metric_name = "AUC"
-
-                    metric_entries = per_source_metrics.setdefault(metric_name, [])
-                    if self._value_exists(metric_entries, value):
-                        continue
-
-                    snippet = self._make_snippet(clean_text, match.start(), match.end())
-                    context_tags = self._context_tags(snippet)
-                    evidence = self._build_evidence(
-                        source_id,
-                        snippet,
-                        context_tags,
-                        offset_start=match.start(),
-                        offset_end=match.end(),
-                    )
-
-                    warnings: List[str] = []
-                    ambiguous = source_id in ambiguous_sources
-                    if ambiguous:
-                        warnings.append("ambiguous_condition")
-                    if context_tags.get("animal") and not context_tags.get("human"):
-                        warnings.append("animal_study_warning")
-                    if not context_tags.get("fasted") and not context_tags.get("fed"):
-                        warnings.append("feeding_condition_unknown")
-
-                    conflict_sources, conflict_warnings = self._detect_conflicts(
-                        pk_values, metric_name, value, source_id
-                    )
-                    warnings.extend(conflict_warnings)
-
-                    pk_values.append(
-                        PKValue(
-                            name=metric_name,
-                            value=value,
-                            unit=unit,
-                            evidence=[evidence],
-                            warnings=warnings,
-                            conflict_sources=conflict_sources or None,
-                            ambiguous_condition=ambiguous or None,
-                        )
-                    )
-                    metric_entries.append((value, len(pk_values) - 1))
+            for metric, match, base in metric_hits.get(source_id, ()):
+                group = _METRIC_GROUPS[metric]
+                # The value group is \d+(?:\.\d+)?, which float() always parses.
+                value = float(match.group(f"{group}_value"))
+                unit = match.group(f"{group}_unit") if _METRIC_REGEX_PARTS[metric][1] is not None else "%"
+                start, end = match.span(group)
+                start -= base
+                end -= base
+                metric_name = metric
+                if metric == "AUC":
+                    label = (match.group(f"{group}_label") or "").lower()
+                    if "inf" in label or "∞" in label:
+                        metric_name = "AUC0-inf"
+                    elif "0-t" in label or "0t" in label:
+                        metric_name = "AUC0-t"
+                    else:
+                        metric_name = "AUC"
+
+                metric_entries = per_source_metrics.setdefault(metric_name, [])
+                if self._value_exists(metric_entries, value):
+                    continue
 
-                    if len(metric_entries) > 1:
-                        for _, idx in metric_entries:
-                            self._add_warning(pk_values[idx], "multiple_values_in_source")
+                left, right = self._snippet_bounds(len(clean_text), start, end)
+                snippet = clean_text[left:right]
+                if lower_aligned:
+                    tag_mask = self._context_tag_mask(clean_lower, left, right)
+                else:
+                    tag_mask = self._context_tag_mask(snippet.lower())
+                evidence = self._build_evidence(
+                    source_id,
+                    snippet,
+                    self._tags_from_mask(tag_mask),
+                    offset_start=start,
+                    offset_end=end,
+                )
 
-                    found_metrics.add(metric_name)
+                warnings: List[str] = []
+                if ambiguous:
+                    warnings.append("ambiguous_condition")
+                if tag_mask & (_TAG_ANIMAL | _TAG_HUMAN) == _TAG_ANIMAL:
+                    warnings.append("animal_study_warning")
+                if not tag_mask & (_TAG_FASTED | _TAG_FED):
+                    warnings.append("feeding_condition_unknown")
 
-            for match in self.ci_pattern.finditer(clean_text):
-                ci_low = safe_float(match.group("low"))
-                ci_high = safe_float(match.group("high"))
-                if ci_low is None or ci_high is None:
-                    continue
-                snippet = self._make_snippet(clean_text, match.start(), match.end())
-                param = self._infer_ci_param(snippet)
+                conflict_sources, conflict_warnings = self._detect_conflicts(
+                    pk_values, metric_conflicts.get(metric_name), value, source_id
+                )
+                warnings.extend(conflict_warnings)
+
+                # Fields come straight from our own regex groups, so skip pydantic re-validation.
+                pk_values.append(
+                    PKValue.model_construct(
+                        name=metric_name,
+                        value=value,
+                        unit=unit,
+                        evidence=[evidence],
+                        warnings=warnings,
+                        conflict_sources=conflict_sources or None,
+                        ambiguous_condition=ambiguous or None,
+                    )
+                )
+                metric_entries.append((value, len(pk_values) - 1))
+                tracked = metric_conflicts.get(metric_name)
+                if tracked is None:
+                    tracked = metric_conflicts[metric_name] = _MetricConflicts(first=value, low=value, high=value)
+                tracked.add(value, len(pk_values) - 1, self._source_label(pk_values[-1]))
+
+                if len(metric_entries) > 1:
+                    for _, idx in metric_entries:
+                        self._add_warning(pk_values[idx], "multiple_values_in_source")
+
+                found_metrics.add(metric_name)
+
+            # A CI is only kept when its snippet names Cmax or AUC, so abstracts mentioning neither skip the scan.
+            ci_matches = self.ci_pattern.finditer(clean_text) if "cmax" in clean_lower or "auc" in clean_lower else ()
+            for match in ci_matches:
+                # Both bounds are \d+(?:\.\d+)? groups, so float() cannot fail.
+                ci_low = float(match.group("low"))
+                ci_high = float(match.group("high"))
+                start, end = match.span()
+                left, right = self._snippet_bounds(len(clean_text), start, end)
+                if lower_aligned:
+                    lower_view = (clean_lower, left, right)
+                else:
+                    snippet_lower = clean_text[left:right].lower()
+                    lower_view = (snippet_lower, 0, len(snippet_lower))
+                param = self._infer_ci_param(*lower_view)
                 if not param:
                     continue
+                snippet = clean_text[left:right]
                 cl = match.group("cl")
                 confidence_level = float(cl) / 100.0 if cl else 0.90
-                gmr = self._infer_gmr(snippet)
+                gmr = self._infer_gmr(clean_text, left, right)
+                # n_pattern starts with \b, which would look before a bounded pos, so it gets the slice.
                 n_val = self._infer_n(snippet)
                 warnings: List[str] = []
-                ambiguous = source_id in ambiguous_sources
                 if ambiguous:
                     warnings.append("ambiguous_condition")
                 if confidence_level != 0.90:
                     warnings.append("confidence_level_not_90")
                 ci_type = "ratio"
-                low_str = f"{ci_low}"
-                high_str = f"{ci_high}"
-                if re.search(rf"{re.escape(low_str)}\s*%", snippet) or re.search(
-                    rf"{re.escape(high_str)}\s*%", snippet
-                ):
+                percent_numbers = {m.group(1) for m in _PERCENT_NUMBER.finditer(clean_text, left, right)}
+                if f"{ci_low}" in percent_numbers or f"{ci_high}" in percent_numbers:
                     ci_type = "percent"
-                context_tags = self._context_tags(snippet)
                 evidence = self._build_evidence(
                     source_id,
                     snippet,
-                    context_tags,
-                    offset_start=match.start(),
-                    offset_end=match.end(),
+                    self._tags_from_mask(self._context_tag_mask(*lower_view)),
+                    offset_start=start,
+                    offset_end=end,
                 )
                 ci_values.append(
-                    CIValue(
+                    CIValue.model_construct(
                         param=param,
                         ci_low=ci_low,
                         ci_high=ci_high,
@@ -269,14 +486,7 @@ class PKExtractor:
                 )
 
         if self.llm_extractor is not None:
-            for source_id, text in abstracts.items():
-                clean_text = normalize_space(text)
-                if not clean_text:
-                    continue
-                try:
-                    llm_data = self.llm_extractor.extract(inn=inn or "", pmid=source_id, abstract_text=clean_text)
-                except Exception:
-                    continue
+            for source_id, clean_text, llm_data in self._run_llm_extractor(normalized, inn):
                 if not llm_data:
                     continue
                 try:
@@ -299,20 +509,18 @@ class PKExtractor:
                     continue
 
         if "CVintra" not in found_metrics and self.llm_client is not None:
-            for source_id, text in abstracts.items():
-                if not source_id.startswith("PMCID:"):
-                    continue
+            pmc_sources = [(source_id, text) for source_id, text in abstracts.items() if source_id.startswith("PMCID:")]
+            # Fetched one source at a time: the loop stops at the first source that yields a CV.
+            for source_id, text in pmc_sources:
+                fetch_ok, fetched = self._fetch_pmc_payload(source_id)
+                ambiguous = source_id in ambiguous_sources
                 supplementary_present = False
                 pmc_payload = {"snippets_text": "", "target_text": "", "full_text": text or "", "warnings": []}
-                if self.pmc_fetcher is not None:
-                    try:
-                        fetched = self.pmc_fetcher(source_id)
-                        if isinstance(fetched, dict):
-                            pmc_payload.update(fetched)
-                        else:
-                            pmc_payload["full_text"] = fetched or ""
-                    except Exception:
-                        pass
+                if fetch_ok:
+                    if isinstance(fetched, dict):
+                        pmc_payload.update(fetched)
+                    else:
+                        pmc_payload["full_text"] = fetched or ""
                 for w in pmc_payload.get("warnings") or []:
                     if w and w not in self.last_warnings:
                         self.last_warnings.append(w)
@@ -322,6 +530,12 @@ class PKExtractor:
                 if not contexts and pmc_payload.get("full_text"):
                     contexts = [("full_text", (pmc_payload.get("full_text") or "")[:12000])]
 
+                # The LLM pass is only worth its cost when the article mentions within-subject variability.
+                cv_hinted = any(
+                    _CV_HINT_RE.search(pmc_payload.get(key) or "")
+                    for key in ("snippets_text", "target_text", "full_text")
+                )
+
                 cv_found = False
                 ci_found = False
                 row_present_any = False
@@ -333,8 +547,13 @@ class PKExtractor:
                     if row_m:
                         row_present_any = True
 
-                    llm_result = self.llm_client.extract_pk_from_text(
-                        payload_text, inn=inn or "", source_id=source_id, location=loc_label
+                    # A table row with CI bounds and a CV column counts as a mention too.
+                    llm_result = (
+                        self.llm_client.extract_pk_from_text(
+                            payload_text, inn=inn or "", source_id=source_id, location=loc_label
+                        )
+                        if cv_hinted or row_m
+                        else None
                     )
                     flat = normalize_llm_payload(llm_result)
 
@@ -349,7 +568,7 @@ class PKExtractor:
                                 cv_fallback = None
                         if cv_fallback is not None:
                             pmc_url = self._pmc_url(source_id)
-                            evidence = Evidence(
+                            evidence = _construct_evidence(
                                 source_id=source_id,
                                 pmid_or_url=pmc_url,
                                 pmid=None,
@@ -358,16 +577,16 @@ class PKExtractor:
                                 location=loc_label,
                             )
                             warnings = ["regex_fallback_cv"]
-                            if source_id in ambiguous_sources:
+                            if ambiguous:
                                 warnings.append("ambiguous_condition")
                             pk_values.append(
-                                PKValue(
+                                PKValue.model_construct(
                                     name="CVintra",
                                     value=cv_fallback,
                                     unit="%",
                                     evidence=[evidence],
                                     warnings=warnings,
-                                    ambiguous_condition=(source_id in ambiguous_sources) or None,
+                                    ambiguous_condition=ambiguous or None,
                                 )
                             )
                             if "regex_fallback_cv" not in self.last_warnings:
@@ -383,7 +602,7 @@ class PKExtractor:
                             cv_float = None
                         if cv_float is not None:
                             pmc_url = self._pmc_url(source_id)
-                            evidence = Evidence(
+                            evidence = _construct_evidence(
                                 source_id=source_id,
                                 pmid_or_url=pmc_url,
                                 pmid=None,
@@ -392,16 +611,17 @@ class PKExtractor:
                                 location=loc_label,
                             )
                             llm_warnings = ["llm_extracted_requires_human_review"]
-                            if source_id in ambiguous_sources:
+                            if ambiguous:
                                 llm_warnings.append("ambiguous_condition")
+                            # cv_float is already a float and the rest is ours; skip re-validation.
                             pk_values.append(
-                                PKValue(
+                                PKValue.model_construct(
                                     name="CVintra",
                                     value=cv_float,
                                     unit="%",
                                     evidence=[evidence],
                                     warnings=llm_warnings,
-                                    ambiguous_condition=(source_id in ambiguous_sources) or None,
+                                    ambiguous_condition=ambiguous or None,
                                 )
                             )
                             found_metrics.add("CVintra")
@@ -419,7 +639,7 @@ class PKExtractor:
                                 ci_low_f = ci_high_f = None
                             if ci_low_f is not None and ci_high_f is not None:
                                 ci_warnings = ["llm_extracted_requires_human_review"]
-                                if source_id in ambiguous_sources:
+                                if ambiguous:
                                     ci_warnings.append("ambiguous_condition")
                                 pmc_url = self._pmc_url(source_id)
                                 ci_values.append(
@@ -433,7 +653,7 @@ class PKExtractor:
                                         design_hint=None,
                                         gmr=None,
                                         evidence=[
-                                            Evidence(
+                                            _construct_evidence(
                                                 source_id=source_id,
                                                 pmid_or_url=pmc_url,
                                                 pmid=None,
@@ -443,7 +663,7 @@ class PKExtractor:
                                             )
                                         ],
                                         warnings=ci_warnings,
-                                        ambiguous_condition=(source_id in ambiguous_sources) or None,
+                                        ambiguous_condition=ambiguous or None,
                                     )
                                 )
                                 ci_found = True
@@ -459,10 +679,10 @@ class PKExtractor:
                         if ci_low_f is not None and ci_high_f is not None:
                             pmc_url = self._pmc_url(source_id)
                             ci_warnings = ["regex_fallback_ci"]
-                            if source_id in ambiguous_sources:
+                            if ambiguous:
                                 ci_warnings.append("ambiguous_condition")
                             ci_values.append(
-                                CIValue(
+                                CIValue.model_construct(
                                     param=ci_param,
                                     ci_low=ci_low_f,
                                     ci_high=ci_high_f,
@@ -472,7 +692,7 @@ class PKExtractor:
                                     design_hint=None,
                                     gmr=None,
                                     evidence=[
-                                        Evidence(
+                                        _construct_evidence(
                                             source_id=source_id,
                                             pmid_or_url=pmc_url,
                                             pmid=None,
@@ -482,7 +702,7 @@ class PKExtractor:
                                         )
                                     ],
                                     warnings=ci_warnings,
-                                    ambiguous_condition=(source_id in ambiguous_sources) or None,
+                                    ambiguous_condition=ambiguous or None,
                                 )
                             )
                             ci_found = True
@@ -516,21 +736,109 @@ class PKExtractor:
             "design_hints": design_hints,
         }
 
-        auc_found = any(m in found_metrics for m in ["AUC", "AUC0-inf", "AUC0-t"])
-        missing = []
-        for m in ["Cmax", "AUC", "t1/2", "CVintra"]:
-            if m == "AUC" and auc_found:
-                continue
-            if m not in found_metrics:
-                missing.append(m)
+        auc_found = not _AUC_METRICS.isdisjoint(found_metrics)
+        missing = [
+            m for m in _REQUIRED_METRICS if m not in found_metrics and not (m == "AUC" and auc_found)
+        ]
         return pk_values, ci_values, missing
 
+    def _run_llm_extractor(self, texts: Dict[str, str], inn: str | None) -> List[Tuple[str, str, Any]]:
+        """Call llm_extractor for every text; the calls are network-bound, so they run concurrently.
+
+        Results keep the input order so merging stays deterministic; a failed call yields None.
+        """
+
+        def _call(item: Tuple[str, str]) -> Any:
+            source_id, text = item
+            try:
+                return self.llm_extractor.extract(inn=inn or "", pmid=source_id, abstract_text=text)
+            except Exception:
+                return None
+
+        items = list(texts.items())
+        if len(items) <= 1:
+            results = [_call(item) for item in items]
+        else:
+            with ThreadPoolExecutor(max_workers=min(_LLM_MAX_WORKERS, len(items))) as pool:
+                results = list(pool.map(_call, items))
+        return [(source_id, text, result) for (source_id, text), result in zip(items, results)]
+
+    def _fetch_pmc_payload(self, source_id: str) -> Tuple[bool, Any]:
+        """Fetch full text for one PMC source as (ok, payload); a missing fetcher or a failed call yields (False, None)."""
+        if self.pmc_fetcher is None:
+            return False, None
+        try:
+            return True, self.pmc_fetcher(source_id)
+        except Exception:
+            return False, None
+
+    @staticmethod
+    def _scan_metrics(
+        texts: Dict[str, str], first_match_only: bool = False
+    ) -> Dict[str, List[Tuple[str, re.Match[str], int]]]:
+        """Run all metric patterns over all texts in one pass.
+
+        Texts are joined with _SCAN_SEPARATOR, which no metric pattern can match across. Returns, per
+        source, ``(metric, match, base)`` where ``match.span(...) - base`` is the offset in that source's
+        text; matches are the same as ``finditer`` per pattern and text, grouped in ``patterns`` order.
+        With first_match_only, only the first match per pattern and text is kept, and the rest of a
+        text is skipped once every pattern has matched in it.
+        """
+        source_ids = list(texts)
+        bases: List[int] = []
+        parts: List[str] = []
+        pos = 0
+        for source_id in source_ids:
+            bases.append(pos)
+            parts.append(texts[source_id])
+            parts.append(_SCAN_SEPARATOR)
+            pos += len(texts[source_id]) + len(_SCAN_SEPARATOR)
+        buffer = "".join(parts)
+
+        hits: List[Dict[str, List[re.Match[str]]]] = [{} for _ in source_ids]
+        next_start: Dict[str, int] = {}
+        pos = 0
+        while pos < len(buffer):
+            for match in _METRIC_SCAN.finditer(buffer, pos):
+                group = match.lastgroup
+                start, end = match.span(group)
+                if start < next_start.get(group, 0):
+                    # finditer on the single pattern would resume after its previous match.
+                    continue
+                next_start[group] = end
+                idx = bisect_right(bases, start) - 1
+                source_hits = hits[idx]
+                if not first_match_only:
+                    source_hits.setdefault(group, []).append(match)
+                    continue
+                if group in source_hits:
+                    continue
+                source_hits[group] = [match]
+                if len(source_hits) == len(_METRIC_GROUPS):
+                    # Everything found in this text; resume at the next one.
+                    pos = bases[idx + 1] if idx + 1 < len(bases) else len(buffer)
+                    break
+            else:
+                break
+
+        return {
+            source_id: [
+                (metric, match, base) for metric, group in _METRIC_GROUPS.items() for match in source_hits.get(group, ())
+            ]
+            for source_id, base, source_hits in zip(source_ids, bases, hits)
+            if source_hits
+        }
+
     @staticmethod
     def _make_snippet(text: str, start: int, end: int, window: int = 200) -> str:
+        left, right = PKExtractor._snippet_bounds(len(text), start, end, window)
+        return text[left:right]
+
+    @staticmethod
+    def _snippet_bounds(text_len: int, start: int, end: int, window: int = 200) -> Tuple[int, int]:
+        # Clamp both bounds up front (max 2 * window chars) so the excerpt is sliced once.
         left = max(0, start - window)
-        right = min(len(text), end + window)
-        snippet = text[left:right]
-        return snippet[:400]
+        return left, min(text_len, end + window, left + 2 * window)
 
     @staticmethod
     def _build_evidence(
@@ -547,7 +855,7 @@ class PKExtractor:
             pmc_id = f"PMC{pmc_id}"
         url = None if not source_is_pmc else f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmc_id}/"
         pmid_or_url = url or f"PMID:{source_id}"
-        return Evidence(
+        return _construct_evidence(
             source_id=source_id,
             pmid_or_url=pmid_or_url,
             pmid=source_id if not source_is_pmc else None,
@@ -560,19 +868,19 @@ class PKExtractor:
         )
 
     @staticmethod
-    def _infer_ci_param(snippet: str) -> str | None:
-        text = snippet.lower()
-        if "cmax" in text:
+    def _infer_ci_param(text_lower: str, pos: int = 0, endpos: int | None = None) -> str | None:
+        """CI parameter named in text_lower[pos:endpos] (Cmax wins over AUC)."""
+        if text_lower.find("cmax", pos, endpos) != -1:
             return "Cmax"
-        if "auc" in text:
+        if text_lower.find("auc", pos, endpos) != -1:
             return "AUC"
         return None
 
-    def _infer_gmr(self, snippet: str) -> float | None:
-        match = self.gmr_pattern.search(snippet)
+    def _infer_gmr(self, text: str, pos: int = 0, endpos: int | None = None) -> float | None:
+        match = self.gmr_pattern.search(text, pos, len(text) if endpos is None else endpos)
         if not match:
             return None
-        return safe_float(match.group(2))
+        return float(match.group(2))
 
     def _infer_n(self, snippet: str) -> int | None:
         match = self.n_pattern.search(snippet)
@@ -584,45 +892,58 @@ class PKExtractor:
             return None
 
     @staticmethod
-    def _infer_design_hint(text: str) -> str | None:
+    def _infer_design_hint(text: str, terms: set[str] | None = None) -> str | None:
+        if terms is None:
+            terms = PKExtractor._design_terms(text.lower())
         hints: List[str] = []
-        text_l = text.lower()
-        if "2x2" in text_l or "2×2" in text_l or "crossover" in text_l:
+        if "crossover" in terms:
             hints.append("2x2_crossover")
-        if "log" in text_l and "transform" in text_l:
+        if "log" in terms and "transform" in terms:
             hints.append("log_transformed")
         return "; ".join(hints) if hints else None
 
     @staticmethod
-    def _context_tags(snippet: str) -> Dict[str, bool]:
-        text = snippet.lower()
-        return {
-            "fasted": any(term in text for term in ["fasted", "fasting", "overnight fast", "empty stomach"]),
-            "fed": any(
-                term in text
-                for term in ["fed", "high-fat meal", "high fat meal", "standard meal", "after meal", "postprandial"]
-            ),
-            "human": any(term in text for term in ["subject", "volunteer", "patient", "human"]),
-            "animal": any(term in text for term in ["rat", "dog", "rabbit", "animal", "mouse"]),
-            "crossover": any(term in text for term in ["crossover", "cross-over", "2x2", "2×2"]),
-            "log_transformed": any(term in text for term in ["log-transformed", "ln(", "log-scale"]),
-        }
+    def _design_terms(text_lower: str) -> set[str]:
+        """Design keyword groups (see _DESIGN_TERM_RE) present in already-lowered text, found in one pass."""
+        terms: set[str] = set()
+        for match in _DESIGN_TERM_RE.finditer(text_lower):
+            terms.add(match.lastgroup)
+            if match.group("log_scale"):
+                terms.add("log_scale")
+            if len(terms) == _DESIGN_TERM_COUNT:
+                break
+        return terms
+
+    @staticmethod
+    def _context_tag_mask(text_lower: str, pos: int = 0, endpos: int | None = None) -> int:
+        """Tag bits for text_lower[pos:endpos]; the tag regex has no anchors, so a bounded scan equals a slice."""
+        mask = 0
+        for match in _CONTEXT_TAG_RE.finditer(text_lower, pos, len(text_lower) if endpos is None else endpos):
+            mask |= _TAG_BITS[match.lastgroup]
+            if mask == _ALL_TAGS:
+                break
+        return mask
+
+    @staticmethod
+    def _tags_from_mask(mask: int) -> Dict[str, bool]:
+        return {tag: bool(mask & bit) for tag, bit in _TAG_BITS.items()}
+
+    @staticmethod
+    def _context_tags(snippet_lower: str) -> Dict[str, bool]:
+        return PKExtractor._tags_from_mask(PKExtractor._context_tag_mask(snippet_lower))
 
     def _infer_study_condition(
-        self, text: str
+        self, text_l: str
     ) -> tuple[str, Dict[str, Any] | None, bool, bool, bool]:
-        text_l = text.lower()
-        fasted_terms = ["fasted", "fasting", "overnight fast", "empty stomach"]
-        fed_terms = [
-            "fed",
-            "high-fat meal",
-            "high fat meal",
-            "standard meal",
-            "after meal",
-            "postprandial",
-        ]
-        fasted = any(term in text_l for term in fasted_terms)
-        fed = any(term in text_l for term in fed_terms)
+        """Feeding condition from already-lowered text."""
+        fed = fasted = False
+        for match in _FEEDING_RE.finditer(text_l):
+            if match.lastgroup == "fed":
+                fed = True
+            else:
+                fasted = True
+            if fed and fasted:
+                break
         condition = "unknown"
         conflict = fed and fasted
         if fed and not fasted:
@@ -684,15 +1005,13 @@ class PKExtractor:
             return False
         return any(details.get(key) is not None for key in ["calories_kcal", "fat_g", "timing_min", "note"])
 
-    def _infer_design_hints(self, text: str) -> Dict[str, Any]:
-        text_l = text.lower()
+    def _infer_design_hints(self, text: str, terms: set[str] | None = None) -> Dict[str, Any]:
+        if terms is None:
+            terms = self._design_terms(text.lower())
         hints: Dict[str, Any] = {
-            "is_crossover_2x2": bool(
-                "2x2" in text_l or "2×2" in text_l or "crossover" in text_l or "cross-over" in text_l
-            ),
-            "log_transform": bool(
-                ("log" in text_l and "transform" in text_l) or "log-transformed" in text_l or "log-scale" in text_l
-            ),
+            "is_crossover_2x2": "crossover" in terms or "cross_over" in terms,
+            # "log-transformed" implies both "log" and "transform".
+            "log_transform": ("log" in terms and "transform" in terms) or "log_scale" in terms,
             "n": None,
         }
         n_val = self._infer_n(text)
@@ -766,6 +1085,8 @@ class PKExtractor:
         if not llm_pk_raw and not llm_ci_raw:
             return pk_values, ci_values, found_metrics
 
+        # Offsets of value strings already searched in this abstract, shared by all LLM items.
+        value_positions: Dict[str, int] = {}
         llm_pk_values: List[PKValue] = []
         for item in llm_pk_raw:
             try:
@@ -774,28 +1095,52 @@ class PKExtractor:
                 continue
             if pk_item.value is None or not pk_item.name:
                 continue
-            self._ensure_llm_evidence(pk_item, source_id, text)
+            self._ensure_llm_evidence(pk_item, source_id, text, value_positions)
             self._add_warning(pk_item, "llm_extracted_requires_human_review")
             if ambiguous_source:
                 pk_item.ambiguous_condition = True
                 self._add_warning(pk_item, "ambiguous_condition")
             llm_pk_values.append(pk_item)
 
+        # Existing PK positions by name, and by (name, value bucket) for the 1e-6 equality check.
+        by_name: Dict[str, List[int]] = defaultdict(list)
+        by_value: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+
+        def _index(idx: int, pk: PKValue) -> None:
+            if pk.value is None:
+                return
+            by_name[pk.name].append(idx)
+            bucket = _value_bucket(pk.value)
+            if bucket is not None:
+                by_value[(pk.name, bucket)].append(idx)
+
+        for idx, pk in enumerate(pk_values):
+            _index(idx, pk)
+
         for pk_item in llm_pk_values:
-            existing_same = [pk for pk in pk_values if pk.name == pk_item.name and pk.value is not None]
-            if any(abs(pk.value - pk_item.value) <= 1e-6 for pk in existing_same if pk.value is not None):
-                for pk in existing_same:
-                    if pk.value is None:
-                        continue
-                    if abs(pk.value - pk_item.value) <= 1e-6 and not pk.evidence and pk_item.evidence:
-                        pk.evidence = pk_item.evidence
-                        self._add_warning(pk, "llm_evidence_applied")
-                        break
+            bucket = _value_bucket(pk_item.value)
+            if bucket is not None:
+                candidates = sorted(
+                    idx for near in range(bucket - 2, bucket + 3) for idx in by_value.get((pk_item.name, near), ())
+                )
+            else:
+                candidates = by_name.get(pk_item.name, [])
+            same_value = [idx for idx in candidates if abs(pk_values[idx].value - pk_item.value) <= 1e-6]
+            if same_value:
+                if pk_item.evidence:
+                    for idx in same_value:
+                        pk = pk_values[idx]
+                        if not pk.evidence:
+                            pk.evidence = pk_item.evidence
+                            self._add_warning(pk, "llm_evidence_applied")
+                            break
                 continue
+            existing_same = by_name.get(pk_item.name)
             if existing_same:
-                for pk in existing_same:
-                    self._add_warning(pk, "llm_conflict_with_regex")
+                for idx in existing_same:
+                    self._add_warning(pk_values[idx], "llm_conflict_with_regex")
                 self._add_warning(pk_item, "llm_conflict_with_regex")
+            _index(len(pk_values), pk_item)
             pk_values.append(pk_item)
             found_metrics.add(pk_item.name)
 
@@ -804,7 +1149,7 @@ class PKExtractor:
                 ci_item = CIValue(**item)
             except Exception:
                 continue
-            self._ensure_llm_ci_evidence(ci_item, source_id, text)
+            self._ensure_llm_ci_evidence(ci_item, source_id, text, value_positions)
             if "llm_extracted_requires_human_review" not in ci_item.warnings:
                 ci_item.warnings.append("llm_extracted_requires_human_review")
             if ambiguous_source:
@@ -815,7 +1160,9 @@ class PKExtractor:
 
         return pk_values, ci_values, found_metrics
 
-    def _ensure_llm_evidence(self, pk_item: PKValue, source_id: str, text: str) -> None:
+    def _ensure_llm_evidence(
+        self, pk_item: PKValue, source_id: str, text: str, value_positions: Dict[str, int] | None = None
+    ) -> None:
         if pk_item.evidence:
             pk_item.evidence = [
                 self._normalize_llm_evidence(ev, source_id) for ev in pk_item.evidence
@@ -823,9 +1170,9 @@ class PKExtractor:
             pk_item.evidence = [e for e in pk_item.evidence if _is_valid_evidence_url(e.pmid_or_url)]
             if pk_item.evidence:
                 return
-        snippet, span = self._find_value_snippet(text, pk_item.value)
+        snippet, span = self._find_value_snippet(text, pk_item.value, value_positions)
         if snippet:
-            context_tags = self._context_tags(snippet)
+            context_tags = self._context_tags(snippet.lower())
             evidence = self._build_evidence(
                 source_id,
                 snippet,
@@ -846,7 +1193,9 @@ class PKExtractor:
             ]
         self._add_warning(pk_item, "llm_missing_evidence")
 
-    def _ensure_llm_ci_evidence(self, ci_item: CIValue, source_id: str, text: str) -> None:
+    def _ensure_llm_ci_evidence(
+        self, ci_item: CIValue, source_id: str, text: str, value_positions: Dict[str, int] | None = None
+    ) -> None:
         if ci_item.evidence:
             ci_item.evidence = [
                 self._normalize_llm_evidence(ev, source_id) for ev in ci_item.evidence
@@ -854,9 +1203,9 @@ class PKExtractor:
             ci_item.evidence = [e for e in ci_item.evidence if _is_valid_evidence_url(e.pmid_or_url)]
             if ci_item.evidence:
                 return
-        snippet, span = self._find_value_snippet(text, ci_item.ci_low)
+        snippet, span = self._find_value_snippet(text, ci_item.ci_low, value_positions)
         if snippet:
-            context_tags = self._context_tags(snippet)
+            context_tags = self._context_tags(snippet.lower())
             evidence = self._build_evidence(
                 source_id,
                 snippet,
@@ -898,12 +1247,20 @@ class PKExtractor:
             )
 
     @staticmethod
-    def _find_value_snippet(text: str, value: float | None) -> tuple[str, tuple[int, int]]:
+    def _find_value_snippet(
+        text: str, value: float | None, positions: Dict[str, int] | None = None
+    ) -> tuple[str, tuple[int, int]]:
         if value is None:
             return "", (0, 0)
-        candidates = [str(value), f"{value:.2f}", f"{value:.1f}", f"{value:.0f}"]
+        # str(value) and the fixed-precision forms often coincide (e.g. "12.5" / "12.50"); search each once.
+        candidates = dict.fromkeys((str(value), f"{value:.2f}", f"{value:.1f}", f"{value:.0f}"))
         for cand in candidates:
-            idx = text.find(cand)
+            if positions is None:
+                idx = text.find(cand)
+            else:
+                idx = positions.get(cand)
+                if idx is None:
+                    idx = positions[cand] = text.find(cand)
             if idx != -1:
                 return PKExtractor._make_snippet(text, idx, idx + len(cand)), (idx, idx + len(cand))
         return "", (0, 0)
@@ -920,38 +1277,24 @@ class PKExtractor:
             pk.warnings.append(warning)
 
     def _detect_conflicts(
-        self, existing: List[PKValue], name: str, value: float, source_id: str
+        self, existing: List[PKValue], tracked: _MetricConflicts | None, value: float, source_id: str
     ) -> Tuple[List[str], List[str]]:
-        new_label = self._format_source_id(source_id)
-        metric_entries = [pk for pk in existing if pk.name == name and pk.value is not None]
-        distinct_values: List[float] = []
-        for pk in metric_entries:
-            if pk.value is None:
-                continue
-            if not any(abs(pk.value - v) <= 1e-6 for v in distinct_values):
-                distinct_values.append(pk.value)
-        if not any(abs(value - v) <= 1e-6 for v in distinct_values):
-            distinct_values.append(value)
-
-        if len(distinct_values) <= 1:
+        # Values of one metric conflict once any of them is more than 1e-6 away from the first one seen.
+        if tracked is None or (
+            max(tracked.high, value) - tracked.first <= 1e-6 and tracked.first - min(tracked.low, value) <= 1e-6
+        ):
             return [], []
 
-        conflict_sources = sorted(
-            {
-                self._source_label(pk)
-                for pk in metric_entries
-                if self._source_label(pk) is not None
-            }
-            | {new_label}
-        )
+        new_label = self._format_source_id(source_id)
+        conflict_sources = tracked.labels_with(new_label)
         new_warnings = []
         for other in conflict_sources:
             if other == new_label:
                 continue
             new_warnings.append(f"conflict_detected:{new_label}vs {other}")
 
-        for pk in metric_entries:
-            pk_source = self._source_label(pk)
+        for idx, pk_source in tracked.entries:
+            pk = existing[idx]
             for other in conflict_sources:
                 if other == pk_source:
                     continue
@@ -967,25 +1310,6 @@ class PKExtractor:
             return ev.pmid_or_url or ev.source_id or ev.pmid or ev.url or ev.source or "unknown"
         return "unknown"
 
-    @staticmethod
-    def _format_source_id(source_id: str) -> str:
-        if source_id.startswith("http"):
-            return source_id
-        if source_id.startswith("PMID:"):
-            return source_id
-        if source_id.startswith("PMCID:"):
-            pmc_id = source_id.replace("PMCID:", "")
-            if pmc_id and not pmc_id.upper().startswith("PMC"):
-                pmc_id = f"PMC{pmc_id}"
-            return f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmc_id}/"
-        return f"PMID:{source_id}"
+    _format_source_id = staticmethod(_format_source_id)
 
-    @staticmethod
-    def _pmc_url(source_id: str) -> str:
-        match = re.search(r"(\d+)", source_id)
-        if not match:
-            return ""
-        pmc_id = match.group(1)
-        if not pmc_id.upper().startswith("PMC"):
-            pmc_id = f"PMC{pmc_id}"
-        return f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmc_id}/"
+    _pmc_url = staticmethod(_pmc_url)
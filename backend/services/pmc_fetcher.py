@@ -1,11 +1,32 @@
 from __future__ import annotations
 
 import re
-import time
-from typing import Dict, List, Tuple
-from xml.etree import ElementTree
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-import requests
+from diskcache import Cache
+from lxml import etree as ElementTree
+
+from backend.services.utils import HTTP_SESSION, ncbi_rate_limiter
+
+# Shared NCBI session (pooled keep-alive, gzip, retries on 429/5xx).
+_SESSION = HTTP_SESSION
+
+# Published PMC articles rarely change; re-fetch monthly to pick up corrections.
+_SECTIONS_TTL_SECONDS = 30 * 24 * 3600
+
+# libxml2 options for eFetch XML: no size caps on large tables, never touch the network. Truncated
+# or malformed responses still raise, so they are never mistaken for a complete article.
+_PMC_PARSE_OPTIONS = {"huge_tree": True, "resolve_entities": False, "no_network": True}
+# Elements fetch_pmc_sections reacts to while streaming; everything else is built silently.
+_STREAM_TAGS = ("body", "sec", "table-wrap", "supplementary-material", "ref-list")
+
+_DIGITS_RE = re.compile(r"(\d+)")
+# Keyword sets for (lower-cased) section titles, matched as substrings.
+_EXCLUDED_SEC_WORDS = ("reference", "acknowledg", "appendix", "supplement")
+_TARGET_SEC_WORDS = ("result", "pharmacokinetic", "statistic")
 
 _TABLE_ROW_WITH_CI_AND_CV = re.compile(
     r"(?m)^(Cmax|AUC0[-–]t|AUC0[-–](?:inf|∞)|AUC)\s+.*?"
@@ -14,8 +35,39 @@ _TABLE_ROW_WITH_CI_AND_CV = re.compile(
     re.I,
 )
 
+# build_snippets triggers: CV mentions, CI/GMR/BE wording, PK metric names. Windows are
+# merged regardless of which trigger fired, so all three families share one scan.
+# Literals are prefix-factored (CV(?:intra|w|_w)?, AUC(?:0[-–](?:t|inf))?) and variants
+# that an earlier alternative always shadows ("CI 90", "within subject standard
+# deviation") are dropped; the leading lookahead lets the engine skip every offset
+# that cannot start a trigger. Whitespace gaps are possessive: what follows them is never
+# whitespace, so giving characters back cannot help and long blank runs are not re-tried.
+_TRIG_CV = (
+    r"\b(?:CV(?:intra|w|_w)?|Swr|within[- ]subject|intra[- ]?subject)\b|%\s*+CV\b|CV\s*+%"
+)
+_TRIG_CI = (
+    r"\b(?:CI|90 percent|confidence interval|GMR|geometric mean ratio|bioequivalen(?:ce|t)?|RSABE|"
+    r"reference[- ]scaled)\b|90%\s*+CI"
+)
+_TRIG_PK = r"\b(?:Cmax|AUC(?:0[-–](?:t|inf))?|Tmax|t1/2|half[- ]life)\b"
+_TRIGGERS_UNION = re.compile(
+    rf"(?=[%9abcghirstw])(?:{_TRIG_CV}|{_TRIG_CI}|{_TRIG_PK})",
+    re.IGNORECASE,
+)
+
+# _prioritize_snippet_blocks scoring, one pass per lower-cased block. No group's match can
+# start inside another group's match, so every group present in a block is reported.
+_SCORE_RE = re.compile(
+    r"(?P<cv>\bwithin[- ]subject\b|cv\s*[_w]*\s*%|%\s*cv|\bcv\b)"
+    r"|(?P<ci>\b90\s*%?\s*ci\b|\bci\b|\bgmr\b|geometric mean ratio)"
+    r"|(?P<pk>\bcmax\b|\bauc\b|tmax|t1/2|half[- ]life)"
+)
+_SCORE_WEIGHTS = {"cv": 5, "ci": 3, "pk": 1}
+
 
-def fetch_pmc_sections(pmcid: str) -> Dict[str, object]:
+def fetch_pmc_sections(
+    pmcid: str, cache: Optional[Cache] = None, api_key: Optional[str] = None
+) -> Dict[str, object]:
     """Fetch PMC XML and return structured text for LLM escalation strategy.
 
     Fetches the article and looks for triggers in all sections except References/Appendix
@@ -30,37 +82,66 @@ def fetch_pmc_sections(pmcid: str) -> Dict[str, object]:
       - full_text: all collected body text (sections + tables; no supplement content)
       - supplementary_present: bool — True if article has supplementary-material
       - warnings: list of str — includes "data_may_be_in_supplementary" when supplementary_present
+
+    With a cache, parsed results are kept for _SECTIONS_TTL_SECONDS per pmcid, but only when
+    article body text was extracted; network and XML failures, eFetch <ERROR> replies and
+    body-less records are never cached. Requests share the process-wide NCBI rate limiter; with an
+    api_key they are sent with the key and may go out at the keyed rate (10 req/s).
     """
     numeric_id = _normalize_pmcid(pmcid)
     if not numeric_id:
         return {"snippets_text": "", "target_text": "", "full_text": "", "supplementary_present": False, "warnings": []}
+    cache_key = f"pmc_sections:{pmcid}"
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
 
     # eFetch for db=pmc; PMC may update E-utilities (e.g. Feb 2026) — eFetch expected to remain.
     url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
     params = {"db": "pmc", "id": numeric_id, "rettype": "xml", "retmode": "xml"}
+    if api_key:
+        params["api_key"] = api_key
     try:
-        resp = requests.get(url, params=params, timeout=20)
-        time.sleep(0.35)
+        ncbi_rate_limiter(api_key).wait()
+        resp = _SESSION.get(url, params=params, timeout=20)
         if resp.status_code != 200:
             return {"snippets_text": "", "target_text": "", "full_text": "", "supplementary_present": False, "warnings": []}
-        root = ElementTree.fromstring(resp.content)
+        content = resp.content
     except Exception:
         return {"snippets_text": "", "target_text": "", "full_text": "", "supplementary_present": False, "warnings": []}
 
-    supplementary_present = bool(
-        root.findall(".//supplementary-material")
-        or root.findall(".//sec[@sec-type='supplementary-material']")
-    )
-    body = root.find(".//body")
-    if body is None:
-        return {
-            "snippets_text": "", "target_text": "", "full_text": "", "supplementary_present": supplementary_present,
-            "warnings": ["data_may_be_in_supplementary"] if supplementary_present else [],
-        }
+    result = _parse_pmc_sections(content, pmcid)
+    if result is None:
+        return {"snippets_text": "", "target_text": "", "full_text": "", "supplementary_present": False, "warnings": []}
+    # A transient eFetch <ERROR> (sent with HTTP 200) parses to a body-less payload; caching it
+    # would hide the article's full text for a month.
+    if cache is not None and result["full_text"]:
+        cache.set(cache_key, result, expire=_SECTIONS_TTL_SECONDS)
+    return result
+
+
+def fetch_pmc_sections_bulk(
+    pmcids: List[str], cache: Optional[Cache] = None, api_key: Optional[str] = None, max_workers: int = 8
+) -> List[Dict[str, object]]:
+    """fetch_pmc_sections for many articles, one result per pmcid in input order.
 
-    parent_map = _build_parent_map(root)
+    Fetches run concurrently over the shared session; the NCBI rate limiter still paces the requests.
+    """
+    if not pmcids:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pmcids))) as pool:
+        return list(pool.map(lambda pmcid: fetch_pmc_sections(pmcid, cache=cache, api_key=api_key), pmcids))
 
+
+def _parse_pmc_sections(content: bytes, pmcid: str) -> Optional[Dict[str, object]]:
+    """Build the fetch_pmc_sections payload from eFetch XML; None if the XML cannot be parsed."""
+    if b"<" not in content[:1024]:
+        # Empty bodies and plain-text error pages: not XML, skip parser setup.
+        return None
     sec_texts: List[Dict[str, str]] = []
+    # Paragraph ancestry verdicts, shared by siblings so each chain is climbed once.
+    excluded_cache: Dict[object, bool] = {}
 
     def _collect_sec(sec, depth_label: str = "") -> None:
         title = (sec.findtext("title") or "").strip()
@@ -68,57 +149,69 @@ def fetch_pmc_sections(pmcid: str) -> Dict[str, object]:
         if _is_excluded_sec(sec_type, title):
             return
         text_chunks: List[str] = []
-        for p in sec.findall("./p"):
-            if _is_ref_like(p, parent_map) or _is_inside_table(p, parent_map):
+        for p in sec.iterchildren("p"):
+            if _is_ref_or_table(p, excluded_cache):
                 continue
-            full_text = " ".join("".join(p.itertext()).split())
+            full_text = _elem_text(p)
             if full_text:
                 text_chunks.append(full_text)
         label = title or sec_type or depth_label or "section"
         if text_chunks:
             sec_texts.append({"title": label, "text": "\n".join(text_chunks)})
-        for child in sec.findall("./sec"):
+        for child in sec.iterchildren("sec"):
             _collect_sec(child, label)
 
-    for top_sec in body.findall("./sec"):
-        _collect_sec(top_sec)
+    # Stream the article once: remember the first <body>, collect its top-level sections and
+    # extract tables in document order as they close, note supplements, and drop reference lists.
+    body = None
+    supplementary_present = False
+    table_docs: List[Dict[str, str]] = []
+    try:
+        for event, elem in ElementTree.iterparse(
+            BytesIO(content), events=("start", "end"), tag=_STREAM_TAGS, **_PMC_PARSE_OPTIONS
+        ):
+            tag = elem.tag
+            if event == "start":
+                if tag == "body" and body is None:
+                    body = elem
+                continue
+            if tag == "table-wrap":
+                table_doc = _table_doc(elem)
+                if table_doc:
+                    table_docs.append(table_doc)
+            elif tag == "sec":
+                if elem.get("sec-type") == "supplementary-material":
+                    supplementary_present = True
+                if body is not None and elem.getparent() is body:
+                    _collect_sec(elem)
+                    if sec_texts:
+                        # The body-paragraph fallback below is now ruled out; the section is spent.
+                        elem.clear(keep_tail=True)
+            elif tag == "supplementary-material":
+                supplementary_present = True
+            elif tag == "ref-list":
+                elem.clear(keep_tail=True)
+    except ElementTree.Error:
+        return None
+
+    if body is None:
+        return {
+            "snippets_text": "", "target_text": "", "full_text": "", "supplementary_present": supplementary_present,
+            "warnings": ["data_may_be_in_supplementary"] if supplementary_present else [],
+        }
 
     # Fallback: body paragraphs (excluding refs/tables) if no sections
     if not sec_texts:
         body_paras = []
         for p in body.findall(".//p"):
-            if _is_ref_like(p, parent_map) or _is_inside_table(p, parent_map):
+            if _is_ref_or_table(p, excluded_cache):
                 continue
-            full_text = " ".join("".join(p.itertext()).split())
+            full_text = _elem_text(p)
             if full_text:
                 body_paras.append(full_text)
         if body_paras:
             sec_texts.append({"title": "body", "text": "\n".join(body_paras)})
 
-    table_docs: List[Dict[str, str]] = []
-    for tw in root.findall(".//table-wrap"):
-        label = (tw.findtext("label") or "").strip()
-        caption = (tw.findtext("caption/title") or "").strip() or (tw.findtext("caption/p") or "").strip()
-        grid_text, header = _table_grid_text(tw)
-        foot_parts = []
-        for foot in tw.findall(".//table-wrap-foot//p"):
-            ft = " ".join("".join(foot.itertext()).split())
-            if ft:
-                foot_parts.append(ft)
-        foot = "\n".join(foot_parts) if foot_parts else ""
-        parts = [part for part in [label, caption, grid_text, foot] if part]
-        if parts:
-            table_docs.append(
-                {
-                    "label": label or "table",
-                    "sec_label": _nearest_sec_label(tw, parent_map),
-                    "as_text": "\n".join(parts),
-                    "caption": caption,
-                    "header": header,
-                    "foot": foot,
-                }
-            )
-
     snippets = build_snippets(sec_texts, table_docs, source_id=pmcid)
     snippets_text = (
         "\n---\n".join(
@@ -132,7 +225,7 @@ def fetch_pmc_sections(pmcid: str) -> Dict[str, object]:
     target_chunks = []
     for sec in sec_texts:
         title_l = (sec.get("title") or "").lower()
-        if any(k in title_l for k in ["result", "pharmacokinetic", "statistic"]):
+        if any(k in title_l for k in _TARGET_SEC_WORDS):
             target_chunks.append(sec["text"])
     for table in table_docs:
         target_chunks.append(table["as_text"])
@@ -153,18 +246,40 @@ def fetch_pmc_sections(pmcid: str) -> Dict[str, object]:
     }
 
 
+def _table_doc(tw) -> Optional[Dict[str, str]]:
+    label = (tw.findtext("label") or "").strip()
+    caption = (tw.findtext("caption/title") or "").strip() or (tw.findtext("caption/p") or "").strip()
+    grid_text, header = _table_grid_text(tw)
+    foot_parts = []
+    for foot in tw.findall(".//table-wrap-foot//p"):
+        ft = _elem_text(foot)
+        if ft:
+            foot_parts.append(ft)
+    foot = "\n".join(foot_parts) if foot_parts else ""
+    parts = [part for part in [label, caption, grid_text, foot] if part]
+    if not parts:
+        return None
+    return {
+        "label": label or "table",
+        "sec_label": _nearest_sec_label(tw),
+        "as_text": "\n".join(parts),
+        "caption": caption,
+        "header": header,
+        "foot": foot,
+    }
+
+
 def _prioritize_snippet_blocks(snippets_text: str, max_chars: int = 12000) -> str:
-    blocks = [b.strip() for b in snippets_text.split("\n---\n") if b.strip()]
+    blocks = [b for b in (raw.strip() for raw in snippets_text.split("\n---\n")) if b]
 
     def score(block: str) -> int:
         b = block.lower()
-        s = 0
-        if re.search(r"\bwithin[- ]subject\b|cv\s*[_w]*\s*%|%\s*cv|\bcv\b", b):
-            s += 5
-        if re.search(r"\b90\s*%?\s*ci\b|\bci\b|\bgmr\b|geometric mean ratio", b):
-            s += 3
-        if re.search(r"\bcmax\b|\bauc\b|tmax|t1/2|half[- ]life", b):
-            s += 1
+        found = set()
+        for m in _SCORE_RE.finditer(b):
+            found.add(m.lastgroup)
+            if len(found) == 3:
+                break
+        s = sum(_SCORE_WEIGHTS[group] for group in found)
         if "location:" in b and any(k in b for k in ["results", "methods", "statistic", "pharmacokinetic"]):
             s += 2
         if "location:" in b and any(k in b for k in ["introduction", "discussion"]):
@@ -198,14 +313,9 @@ def prepare_pmc_llm_contexts(pmc_payload: dict, max_chars: int = 12000) -> List[
         contexts.append(("sec:results_pk_stats", target[:max_chars]))
 
     if full:
-        intervals: List[Tuple[int, int]] = []
         window = 800
-        for m in _TABLE_ROW_WITH_CI_AND_CV.finditer(full):
-            start = max(0, m.start() - window)
-            end = min(len(full), m.end() + window)
-            intervals.append((start, end))
-        merged = _merge_intervals(intervals)
-        chunks = [full[s:e].strip() for s, e in merged if full[s:e].strip()]
+        merged = _match_windows(_TABLE_ROW_WITH_CI_AND_CV.finditer(full), window, len(full))
+        chunks = [chunk for chunk in (full[s:e].strip() for s, e in merged) if chunk]
         full_windows = "\n---\n".join(chunks) if chunks else full[:max_chars]
         if full_windows:
             contexts.append(("full_text", full_windows[:max_chars]))
@@ -213,124 +323,121 @@ def prepare_pmc_llm_contexts(pmc_payload: dict, max_chars: int = 12000) -> List[
     return contexts
 
 
-def _merge_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
-    """Merge overlapping (start, end) intervals. Input can be list of lists or tuples."""
-    if not intervals:
-        return []
-    sorted_intervals = sorted(intervals, key=lambda x: (x[0], x[1]))
-    merged: List[Tuple[int, int]] = []
-    for start, end in sorted_intervals:
-        if not merged or start > merged[-1][1]:
-            merged.append((start, end))
+def _match_windows(matches: Iterable[re.Match[str]], window: int, text_len: int) -> Iterator[Tuple[int, int]]:
+    """Merged (start, end) windows of +-window chars around matches, clipped to the text.
+
+    finditer yields matches in start order, so the windows arrive sorted and merge in one sweep.
+    Each window is yielded as soon as the next match cannot reach it, so callers that stop early
+    leave the rest of the text unscanned.
+    """
+    current: Optional[Tuple[int, int]] = None
+    for m in matches:
+        start = max(0, m.start() - window)
+        end = min(text_len, m.end() + window)
+        if current is None:
+            current = (start, end)
+        elif start > current[1]:
+            yield current
+            current = (start, end)
         else:
-            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
-    return merged
+            current = (current[0], max(current[1], end))
+    if current is not None:
+        yield current
 
 
 def build_snippets(sections: List[Dict[str, str]], tables: List[Dict[str, str]], source_id: str = "") -> List[Dict]:
     """Return up to 20 deduped snippets around PK/CV triggers with locations.
     Overlapping windows (e.g. multiple triggers in one paragraph) are merged into one snippet per span.
     """
-    triggers = [
-        (
-            r"\b(?:CV|CVintra|CVw|CV_w|Swr|within[- ]subject|intra[- ]subject|intrasubject|"
-            r"within[- ]subject[- ]standard[- ]deviation)\b|%\s*CV\b|CV\s*%",
-            "cv",
-        ),
-        (r"\b(?:CI|90 percent|CI 90|confidence interval|GMR|geometric mean ratio|bioequivalen(?:ce|t)?|RSABE|reference[- ]scaled)\b|90%\s*CI", "ci"),
-        (r"\b(?:Cmax|AUC|AUC0[-–]t|AUC0[-–]inf|Tmax|t1/2|half[- ]life)\b", "pk"),
-    ]
     window = 400  # chars on each side (~800 total)
-    snippets: List[Dict] = []
-
-    def _intervals_for_text(text: str) -> List[Tuple[int, int]]:
-        intervals: List[Tuple[int, int]] = []
-        for pattern, _ in triggers:
-            for m in re.finditer(pattern, text, flags=re.IGNORECASE):
-                start = max(0, m.start() - window)
-                end = min(len(text), m.end() + window)
-                intervals.append((start, end))
-        return _merge_intervals(intervals)
-
-    for sec in sections:
-        text = sec.get("text", "")
-        title = sec.get("title") or "section"
-        loc = f"sec:{title}"
-        for start, end in _intervals_for_text(text):
-            chunk = text[start:end].strip()
-            if chunk:
-                snippets.append({"text": chunk, "location": loc, "source_id": source_id})
-
-    for table in tables:
-        text = table.get("as_text", "")
-        label = table.get("label") or "table"
-        sec_label = table.get("sec_label") or ""
-        loc = f"table:{label}" if label else "table"
-        if sec_label:
-            loc = f"{loc} ({sec_label})"
-        for start, end in _intervals_for_text(text):
-            chunk = text[start:end].strip()
-            if chunk:
-                snippets.append({"text": chunk, "location": loc, "source_id": source_id})
 
-    # Deduplicate by normalized text, limit to 20
+    def _located_texts() -> Iterator[Tuple[str, str]]:
+        for sec in sections:
+            title = sec.get("title") or "section"
+            yield sec.get("text", ""), f"sec:{title}"
+        for table in tables:
+            label = table.get("label") or "table"
+            sec_label = table.get("sec_label") or ""
+            loc = f"table:{label}" if label else "table"
+            if sec_label:
+                loc = f"{loc} ({sec_label})"
+            yield table.get("as_text", ""), loc
+
+    # Deduplicate by normalized text, limit to 20; later texts are not scanned once the limit is hit.
     uniq: List[Dict] = []
     seen = set()
-    for sn in snippets:
-        key = " ".join(sn["text"].split()).lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        uniq.append(sn)
-        if len(uniq) >= 20:
-            break
+    for text, loc in _located_texts():
+        for start, end in _match_windows(_TRIGGERS_UNION.finditer(text), window, len(text)):
+            chunk = text[start:end].strip()
+            if not chunk:
+                continue
+            key = " ".join(chunk.split()).lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            uniq.append({"text": chunk, "location": loc, "source_id": source_id})
+            if len(uniq) >= 20:
+                return uniq
 
     return uniq
 
 
+@lru_cache(maxsize=256)
 def _normalize_pmcid(pmcid: str) -> str:
     if not pmcid:
         return ""
-    match = re.search(r"(\d+)", pmcid)
+    match = _DIGITS_RE.search(pmcid)
     return match.group(1) if match else ""
 
 
+@lru_cache(maxsize=512)
 def _is_excluded_sec(sec_type: str, title: str) -> bool:
     t = (sec_type or "").lower() + " " + (title or "").lower()
-    return any(word in t for word in ["reference", "acknowledg", "appendix", "supplement"])
+    return any(word in t for word in _EXCLUDED_SEC_WORDS)
 
 
-def _is_ref_like(elem, parent_map: Dict) -> bool:
+def _is_ref_or_table(elem, cache: Dict[object, bool]) -> bool:
+    """True if elem sits in a reference list or a table; every climbed node is memoized in cache."""
+    chain = []
     cur = elem
+    result = False
     while cur is not None:
+        cached = cache.get(cur)
+        if cached is not None:
+            result = cached
+            break
+        chain.append(cur)
         tag = cur.tag.lower()
-        if "ref-list" in tag or tag == "reference":
-            return True
-        cur = parent_map.get(cur)
-    return False
+        if "ref-list" in tag or tag == "reference" or "table-wrap" in tag or tag == "table":
+            result = True
+            break
+        cur = cur.getparent()
+    for node in chain:
+        cache[node] = result
+    return result
 
 
-def _is_inside_table(elem, parent_map: Dict) -> bool:
-    cur = elem
-    while cur is not None:
-        tag = cur.tag.lower()
-        if "table-wrap" in tag or tag == "table":
-            return True
-        cur = parent_map.get(cur)
-    return False
+def _elem_text(elem) -> str:
+    """Whitespace-normalized text content of elem (without its tail), serialized by libxml2."""
+    if len(elem) == 0:
+        # Most cells and many paragraphs are leaves: their text is all there is.
+        return " ".join((elem.text or "").split())
+    return " ".join(ElementTree.tostring(elem, method="text", encoding=str, with_tail=False).split())
 
 
 def _row_text(row) -> str:
-    cells = []
-    for cell in row.findall(".//th") + row.findall(".//td"):
-        text = " ".join("".join(cell.itertext()).split())
+    # One walk over the row; header cells still come before data cells.
+    header_cells = []
+    data_cells = []
+    for cell in row.iter("th", "td"):
+        text = _elem_text(cell)
         if text:
-            cells.append(text)
-    return "\t".join(cells)
+            (header_cells if cell.tag == "th" else data_cells).append(text)
+    return "\t".join(header_cells + data_cells)
 
 
 def _table_grid_text(tw) -> Tuple[str, str]:
-    rows = tw.findall(".//tr")
+    rows = list(tw.iter("tr"))
     if not rows:
         return "", ""
     header = _row_text(rows[0])
@@ -345,20 +452,12 @@ def _table_grid_text(tw) -> Tuple[str, str]:
     return grid_text, header
 
 
-def _build_parent_map(root) -> Dict:
-    parent_map = {}
-    for parent in root.iter():
-        for child in parent:
-            parent_map[child] = parent
-    return parent_map
-
-
-def _nearest_sec_label(elem, parent_map: Dict) -> str:
+def _nearest_sec_label(elem) -> str:
     cur = elem
     while cur is not None:
         if cur.tag.lower().endswith("sec"):
             title = cur.findtext("title") or ""
             label = cur.findtext("label") or ""
             return (label or title).strip()
-        cur = parent_map.get(cur)
+        cur = cur.getparent()
     return ""
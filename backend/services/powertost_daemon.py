@@ -0,0 +1,63 @@
+"""Host-wide PowerTOST worker shared by every backend process over a Unix domain socket.
+
+    python -m backend.services.powertost_daemon --socket /run/powertost.sock
+
+Backend processes started with POWERTOST_SOCKET=/run/powertost.sock send their R jobs here, so one
+Rscript with PowerTOST loaded serves all of them instead of one per process. The wire format is the
+worker's own: one tab-separated job per line in, one JSON line out.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import socketserver
+
+from backend.services.powertost_runner import _WORKER_SCRIPT, _PowerTOSTWorker, _get_rscript_path
+
+_FAILED_REPLY = '{"cv": null, "warnings": ["powertost_runner_failed"]}\n'
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server: PowerTOSTDaemon = self.server  # type: ignore[assignment]
+        for raw in self.rfile:
+            line = raw.decode("utf-8").rstrip("\r\n")
+            reply = server.worker.request(server.rscript, line, timeout=30) or _FAILED_REPLY
+            if not reply.endswith("\n"):
+                reply += "\n"
+            self.wfile.write(reply.encode("utf-8"))
+            self.wfile.flush()
+
+
+class PowerTOSTDaemon(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, rscript: str) -> None:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # stale socket from a previous run
+        self.rscript = rscript
+        self.worker = _PowerTOSTWorker(_WORKER_SCRIPT)
+        super().__init__(socket_path, _JobHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.worker.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve PowerTOST jobs to backend processes over a Unix socket.")
+    parser.add_argument("--socket", default=os.getenv("POWERTOST_SOCKET", "/run/powertost.sock"))
+    args = parser.parse_args()
+    rscript = _get_rscript_path()
+    if not rscript:
+        raise SystemExit("Rscript not found (set RSCRIPT_PATH)")
+    with PowerTOSTDaemon(args.socket, rscript) as server:
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(args.socket):
+                os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,246 @@
 from __future__ import annotations
 
+import atexit
 import json
+import math
 import os
+import queue
 import shutil
+import socket
 import subprocess
-from typing import List, Tuple
+import threading
+import time
+from functools import lru_cache, wraps
+from typing import IO, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 
+_WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), "powertost_worker.R")
+
+# Rscript/PowerTOST availability rarely changes while the process runs; /health re-checks this often.
+_CHECK_TTL_SECONDS = 300
+
+# Path of a powertost_daemon socket; when set, R jobs go to that host-wide worker instead of a
+# per-process Rscript.
+_SOCKET_ENV = "POWERTOST_SOCKET"
+
+# Set to "1" to send CVfromCI jobs to the R worker even for designs computed in-process (oracle runs).
+_USE_R_ENV = "POWERTOST_CVFROMCI_USE_R"
+
+# PowerTOST design constants for the designs cv_from_ci handles in-process:
+# (bk, number of sequences/groups); residual df is n - 2 for both.
+_CVFROMCI_DESIGNS: Dict[str, Tuple[float, int]] = {
+    "2x2": (2.0, 2),
+    "2x2x2": (2.0, 2),
+    "parallel": (4.0, 2),
+}
+
+
+def _cached_for(seconds: float) -> Callable[[Callable[[], Tuple[bool, str]]], Callable[[], Tuple[bool, str]]]:
+    """Memoize a no-argument check for `seconds`; wrapper.cache_clear() forces a re-check."""
+
+    def decorate(check: Callable[[], Tuple[bool, str]]) -> Callable[[], Tuple[bool, str]]:
+        state: dict = {}
+        lock = threading.Lock()
+
+        @wraps(check)
+        def wrapper() -> Tuple[bool, str]:
+            with lock:
+                hit = state.get("result")
+                if hit is not None and time.monotonic() - hit[0] < seconds:
+                    return hit[1]
+            result = check()
+            with lock:
+                state["result"] = (time.monotonic(), result)
+            return result
+
+        wrapper.cache_clear = state.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorate
+
+
+@lru_cache(maxsize=1)
 def _get_rscript_path() -> str | None:
     return os.getenv("RSCRIPT_PATH") or shutil.which("Rscript") or shutil.which("Rscript.exe")
 
 
+class _PowerTOSTWorker:
+    """One persistent Rscript running powertost_worker.R, shared by all threads.
+
+    Starting R and loading PowerTOST costs about a second, so the process is started on first use
+    and kept alive; each job is one line on stdin and one JSON line back. A worker that exits is
+    restarted for the next job; one that does not answer in time is killed.
+    """
+
+    def __init__(self, script_path: str) -> None:
+        self.script_path = script_path
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    def request(self, rscript: str, line: str, timeout: float) -> Optional[str]:
+        """Send one job line and return the worker's JSON reply, or None if it could not be served."""
+        replies = self.request_many(rscript, [line], timeout)
+        return replies[0] if replies else None
+
+    def request_many(self, rscript: str, lines: List[str], timeout: float) -> Optional[List[str]]:
+        """Send all job lines in one write and return one reply per line in order, or None on failure.
+
+        timeout applies to each reply, so a batch is not cut short just because it is long.
+        """
+        with self._lock:
+            for _ in range(2):  # one retry with a fresh worker if the old one has died
+                try:
+                    if self._proc is None or self._proc.poll() is not None:
+                        self._start(rscript)
+                    self._proc.stdin.write("".join(line + "\n" for line in lines))
+                    self._proc.stdin.flush()
+                except OSError:
+                    self._stop()
+                    continue
+                replies: List[str] = []
+                try:
+                    while len(replies) < len(lines):
+                        reply = self._lines.get(timeout=timeout)
+                        if reply is None:  # worker exited before answering
+                            break
+                        replies.append(reply)
+                except queue.Empty:
+                    self._stop()
+                    return None
+                if len(replies) < len(lines):
+                    self._stop()
+                    continue
+                return replies
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop()
+
+    def _start(self, rscript: str) -> None:
+        self._stop()
+        self._proc = subprocess.Popen(
+            [rscript, self.script_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self._lines = queue.Queue()
+        # stdout is drained on a thread so a hung worker can be timed out portably.
+        threading.Thread(target=_pump_lines, args=(self._proc.stdout, self._lines), daemon=True).start()
+
+    def _stop(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except Exception:
+            pass
+
+
+def _pump_lines(stream: IO[str], lines: "queue.Queue[Optional[str]]") -> None:
+    for line in stream:
+        if line.lstrip().startswith("{"):
+            lines.put(line)
+    lines.put(None)
+
+
+class _SocketWorker:
+    """Client for powertost_daemon: same request/request_many contract as _PowerTOSTWorker.
+
+    The connection is kept open between jobs and re-established once if the daemon dropped it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._reader: Optional[IO[str]] = None
+
+    def request(self, rscript: str, line: str, timeout: float) -> Optional[str]:
+        replies = self.request_many(rscript, [line], timeout)
+        return replies[0] if replies else None
+
+    def request_many(self, rscript: str, lines: List[str], timeout: float) -> Optional[List[str]]:
+        """Send job lines to the daemon and read one reply per line; rscript is the daemon's concern."""
+        payload = "".join(line + "\n" for line in lines).encode("utf-8")
+        with self._lock:
+            for _ in range(2):  # one reconnect if the daemon closed the connection
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.settimeout(timeout)
+                    self._sock.sendall(payload)
+                    replies: List[str] = []
+                    while len(replies) < len(lines):
+                        reply = self._reader.readline()
+                        if not reply:
+                            raise ConnectionError("powertost daemon closed the connection")
+                        replies.append(reply)
+                    return replies
+                except socket.timeout:
+                    self._close()
+                    return None
+                except OSError:
+                    self._close()
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self._sock = sock
+        self._reader = sock.makefile("r", encoding="utf-8")
+
+    def _close(self) -> None:
+        sock, self._sock = self._sock, None
+        reader, self._reader = self._reader, None
+        for resource in (reader, sock):
+            try:
+                if resource is not None:
+                    resource.close()
+            except OSError:
+                pass
+
+
+_worker = _PowerTOSTWorker(_WORKER_SCRIPT)
+atexit.register(_worker.close)
+
+
+@lru_cache(maxsize=4)
+def _socket_worker(path: str) -> _SocketWorker:
+    client = _SocketWorker(path)
+    atexit.register(client.close)
+    return client
+
+
+def _job_worker() -> Tuple[Optional[_PowerTOSTWorker | _SocketWorker], str, Optional[str]]:
+    """(worker, rscript, error) for R jobs: the daemon client if POWERTOST_SOCKET is set, else the local worker."""
+    socket_path = os.getenv(_SOCKET_ENV)
+    if socket_path:
+        return _socket_worker(socket_path), "", None
+    rscript = _get_rscript_path()
+    if not rscript:
+        return None, "", "rscript_not_found"
+    if not os.path.exists(_WORKER_SCRIPT):
+        return None, "", "powertost_runner_missing"
+    return _worker, rscript, None
+
+
+@_cached_for(_CHECK_TTL_SECONDS)
 def check_rscript() -> Tuple[bool, str]:
     rscript = _get_rscript_path()
     if not rscript:
@@ -24,18 +254,17 @@ def check_rscript() -> Tuple[bool, str]:
     return True, "Rscript available"
 
 
+@_cached_for(_CHECK_TTL_SECONDS)
 def check_powertost() -> Tuple[bool, str]:
-    rscript = _get_rscript_path()
-    if not rscript:
+    worker, rscript, error = _job_worker()
+    if error == "rscript_not_found":
         return False, "Rscript not found"
+    if error:
+        return False, "PowerTOST worker script missing"
+    # The ping warms up the worker that run_cvfromci reuses.
     try:
-        result = subprocess.run(
-            [rscript, "-e", "suppressMessages(library(PowerTOST)); cat('OK')"],
-            capture_output=True,
-            text=True,
-            timeout=20,
-        )
-        if result.returncode != 0 or "OK" not in (result.stdout or ""):
+        reply = worker.request(rscript, "ping", timeout=20)
+        if reply is None or not json.loads(reply).get("powertost"):
             return False, "PowerTOST not available"
     except Exception as exc:
         return False, f"PowerTOST check failed: {exc}"
@@ -56,41 +285,190 @@ def health() -> dict:
 
 
 def run_cvfromci(lower: float, upper: float, n: int, design: str = "2x2") -> Tuple[float | None, List[str]]:
-    warnings: List[str] = []
-    rscript = _get_rscript_path()
-    if not rscript:
-        return None, ["rscript_not_found"]
-
-    script_path = os.path.join(os.path.dirname(__file__), "powertost_runner.R")
-    if not os.path.exists(script_path):
-        return None, ["powertost_runner_missing"]
-
-    cmd = [
-        rscript,
-        script_path,
-        "--lower",
-        str(lower),
-        "--upper",
-        str(upper),
-        "--n",
-        str(n),
-        "--design",
-        design,
-    ]
+    return run_cvfromci_batch([(lower, upper, n, design)])[0]
+
+
+def run_cvfromci_batch(jobs: List[Tuple[float, float, int, str]]) -> List[Tuple[float | None, List[str]]]:
+    """run_cvfromci for many (lower, upper, n, design) jobs.
+
+    Designs in _CVFROMCI_DESIGNS are computed in-process with PowerTOST's formula; the rest go to the
+    R worker in a single round-trip (all jobs do when POWERTOST_CVFROMCI_USE_R=1). Results keep the
+    job order; if the worker cannot serve its share, each of those jobs gets the same warning.
+    """
+    results: List[Optional[Tuple[float | None, List[str]]]] = [None] * len(jobs)
+    use_r = os.getenv(_USE_R_ENV) == "1"
+    r_jobs: List[int] = []
+    by_design: Dict[str, List[Tuple[int, float, float, int]]] = {}
+    for i, (lower, upper, n, design) in enumerate(jobs):
+        design = design or "2x2"
+        if use_r or design not in _CVFROMCI_DESIGNS:
+            r_jobs.append(i)
+            continue
+        parsed = _cvfromci_inputs(lower, upper, n)
+        if parsed is None:
+            results[i] = (None, ["invalid_parameters"])
+        else:
+            by_design.setdefault(design, []).append((i, *parsed))
+    for design, rows in by_design.items():
+        indices, lowers, uppers, sizes = zip(*rows)
+        cvs = cv_from_ci_vec(np.array(lowers), np.array(uppers), np.array(sizes), design)
+        for i, cv in zip(indices, cvs.tolist()):
+            results[i] = _cvfromci_result(cv)
+    if r_jobs:
+        for i, result in zip(r_jobs, _run_cvfromci_r([jobs[i] for i in r_jobs])):
+            results[i] = result
+    return results  # type: ignore[return-value]
+
+
+def _run_cvfromci_r(jobs: List[Tuple[float, float, int, str]]) -> List[Tuple[float | None, List[str]]]:
+    worker, rscript, error = _job_worker()
+    if error:
+        return [(None, [error]) for _ in jobs]
+
+    lines = ["\t".join(["cvfromci", str(lower), str(upper), str(n), design]) for lower, upper, n, design in jobs]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        replies = worker.request_many(rscript, lines, timeout=30)
     except Exception:
-        return None, ["powertost_runner_failed"]
+        replies = None
+    if replies is None:
+        return [(None, ["powertost_runner_failed"]) for _ in jobs]
+    return [_parse_cv_reply(reply) for reply in replies]
+
 
-    if result.returncode != 0:
-        return None, ["powertost_runner_failed"]
+def cv_from_ci(lower: float, upper: float, n: int, design: str = "2x2", alpha: float = 0.05) -> float:
+    """PowerTOST::CVfromCI for the designs in _CVFROMCI_DESIGNS, returned as a fraction (0.25 = 25%).
 
+    The (1 - 2*alpha) CI half-width on the log scale is t(1 - alpha, n - 2) * SE, with
+    SE^2 = MSE * bk * sum(1/n_i) / s^2 for s sequences of sizes n_i (total n split as evenly as
+    PowerTOST does); CV = sqrt(exp(MSE) - 1). Raises ValueError for inputs PowerTOST rejects.
+    """
+    if design not in _CVFROMCI_DESIGNS:
+        raise ValueError(f"unsupported design: {design}")
+    bk, groups = _CVFROMCI_DESIGNS[design]
+    n = int(n)
+    df = n - 2
+    if df < 1 or lower <= 0 or upper <= 0:
+        raise ValueError("invalid CI or sample size")
+    group_sizes = [n // groups + (1 if g < n % groups else 0) for g in range(groups)]
+    bkni = bk * sum(1.0 / size for size in group_sizes) / (groups * groups)
+    se = abs(math.log(upper) - math.log(lower)) / 2.0 / _t_quantile(1.0 - alpha, df)
+    mse = se * se / bkni
+    return math.sqrt(math.expm1(mse))
+
+
+def cv_from_ci_vec(
+    lower: np.ndarray, upper: np.ndarray, n: np.ndarray, design: str = "2x2", alpha: float = 0.05
+) -> np.ndarray:
+    """cv_from_ci over arrays of studies at once; entries PowerTOST would reject come back as NaN.
+
+    The t quantile is evaluated once per distinct n; everything else is element-wise array math.
+    """
+    if design not in _CVFROMCI_DESIGNS:
+        raise ValueError(f"unsupported design: {design}")
+    bk, groups = _CVFROMCI_DESIGNS[design]
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    n = np.asarray(n, dtype=np.int64)
+    valid = (n - 2 >= 1) & (lower > 0) & (upper > 0)
+
+    n_valid = np.where(valid, n, 3)
+    unique_n, inverse = np.unique(n_valid, return_inverse=True)
+    t = np.array([_t_quantile(1.0 - alpha, int(size) - 2) for size in unique_n])[inverse.reshape(n_valid.shape)]
+    base, extra = np.divmod(n_valid, groups)
+    inv_sizes = sum(1.0 / (base + (g < extra)) for g in range(groups))
+    bkni = bk * inv_sizes / (groups * groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        se = np.abs(np.log(upper) - np.log(lower)) / 2.0 / t
+        cv = np.sqrt(np.expm1(se * se / bkni))
+    return np.where(valid, cv, np.nan)
+
+
+def _cvfromci_inputs(lower: float, upper: float, n: int) -> Optional[Tuple[float, float, int]]:
+    """Job parameters as numbers, or None where the worker would answer invalid_parameters."""
+    try:
+        lower, upper, n = float(lower), float(upper), int(n)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if math.isnan(lower) or math.isnan(upper):
+        return None
+    return lower, upper, n
+
+
+def _cvfromci_result(cv: float) -> Tuple[float | None, List[str]]:
+    """In-process counterpart of the worker's cvfromci reply: same warning codes and percent conversion."""
+    if not math.isfinite(cv):
+        return None, ["cvfromci_failed", "cvfromci_invalid"]
+    if cv <= 1:
+        return cv * 100, ["cv_assumed_fraction"]
+    return cv, []
+
+
+@lru_cache(maxsize=1024)
+def _t_quantile(p: float, df: int) -> float:
+    """Quantile of Student's t with df degrees of freedom, for 0.5 < p < 1 (bisection on the CDF)."""
+    lo, hi = 0.0, 1.0
+    while _t_cdf(hi, df) < p:
+        lo, hi = hi, hi * 2.0
+    for _ in range(200):
+        mid = 0.5 * (lo + hi)
+        if _t_cdf(mid, df) < p:
+            lo = mid
+        else:
+            hi = mid
+        if hi - lo <= 1e-13 * hi:
+            break
+    return 0.5 * (lo + hi)
+
+
+def _t_cdf(t: float, df: int) -> float:
+    """P(T <= t) for t >= 0, via the regularized incomplete beta function."""
+    x = df / (df + t * t)
+    return 1.0 - 0.5 * _betainc(0.5 * df, 0.5, x)
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta I_x(a, b) (continued fraction, modified Lentz)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    if x > (a + 1.0) / (a + b + 2.0):
+        return 1.0 - _betainc(b, a, 1.0 - x)
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    f = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        num = m * (b - m) * x / ((a + m2 - 1.0) * (a + m2))
+        d = 1.0 + num * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + num / c
+        c = c if abs(c) > tiny else tiny
+        f *= d * c
+        num = -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1.0))
+        d = 1.0 + num * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + num / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        f *= delta
+        if abs(delta - 1.0) < 1e-15:
+            break
+    return math.exp(log_front) * f / a
+
+
+def _parse_cv_reply(reply: str) -> Tuple[float | None, List[str]]:
+    warnings: List[str] = []
     try:
-        payload = json.loads(result.stdout.strip())
+        payload = json.loads(reply.strip())
     except Exception:
         return None, ["powertost_runner_invalid_json"]
 
-    warnings.extend(payload.get("warnings", []) or [])
+    reply_warnings = payload.get("warnings", []) or []
+    # jsonlite's auto_unbox turns a one-element warnings vector into a bare string.
+    warnings.extend([reply_warnings] if isinstance(reply_warnings, str) else reply_warnings)
     cv_val = payload.get("cv", None)
     if cv_val is None:
         return None, warnings
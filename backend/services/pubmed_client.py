@@ -1,24 +1,47 @@
 from __future__ import annotations
 
+import hashlib
 import re
-import time
-from typing import Dict, List, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from typing import IO, Any, Callable, Dict, List, Optional, Set, Tuple
 from urllib.parse import quote
-from xml.etree import ElementTree
+
+from lxml import etree as ElementTree
 
 from backend.schemas import SourceCandidate
 from backend.services.utils import (
+    HTTP_SESSION,
     AppConfig,
+    Params,
     get_cache,
+    ncbi_rate_limiter,
     normalize_space,
     request_json_with_cache,
-    request_text_with_cache,
+    request_stream_with_cache,
+    response_cache_key,
 )
 
 
 # 2-step search: if Step A returns fewer than this, run Step B (broader)
 _MIN_RESULTS_STEP_A = 3
 
+# NCBI recommends at most 200 ids per ESummary/EFetch GET request. Longer id lists are posted once to
+# the History Server (EPost) and read back in pages of this size, up to _BATCH_WORKERS pages at once
+# (still rate-limited).
+_EUTILS_BATCH_SIZE = 200
+_BATCH_WORKERS = 4
+
+# ESummary items and abstracts are also cached one id at a time (same TTL as the request cache), so
+# overlapping id lists only fetch the ids not seen recently.
+_PER_ID_TTL_SECONDS = 3600
+
+_YEAR_RE = re.compile(r"(?:19|20)\d{2}")
+# "PMCID:" / "PMID:" / "URL:" ref_id prefix, any case
+_REF_PREFIX_RE = re.compile(r"(PMCID|PMID|URL):", re.I)
+
 # Thematic markers: PK/BE/forms/quality (must appear in query)
 _THEMATIC_TERMS = (
     "bioequivalence[tiab] OR bioavailability[tiab] OR pharmacokinetics[tiab] OR "
@@ -68,6 +91,36 @@ _THEME_KEYWORDS = (
 _MUST_KEYWORDS = ("delayed-release", "delayed release", "enteric", "dissolution")
 # Anti: -10 in title, -5 only in abstract
 _ANTI_KEYWORDS = ("phenotyping", "phenotype", "probe", "cocktail", "microdose")
+# Animal study: -20 (once)
+_ANIMAL_MARKERS = (" in rats", " in mice", " in dogs", "veterinary", " in healthy horses")
+# Every scoring keyword once: title and abstract are each scanned a single time per source.
+_SCAN_KEYWORDS = tuple(dict.fromkeys(_THEME_KEYWORDS + _MUST_KEYWORDS + _ANTI_KEYWORDS + _ANIMAL_MARKERS))
+# Category sets, intersected with the hit sets from _keyword_hits
+_THEME_SET = frozenset(_THEME_KEYWORDS)
+_MUST_SET = frozenset(_MUST_KEYWORDS)
+_ANTI_SET = frozenset(_ANTI_KEYWORDS)
+_ANIMAL_SET = frozenset(_ANIMAL_MARKERS)
+# Title post-filter (_is_noise_title); DDI terms only count as noise outside mode=ddi
+_NOISE_TITLE_TERMS = (
+    "phenotyping",
+    "phenotype",
+    "cocktail",
+    "probe drug",
+    "probe drugs",
+    "microdose",
+    "veterinary",
+    " in rats",
+    " in mice",
+    " in dogs",
+    " in pigs",
+    " in horse",
+    "rat ",
+    "mouse ",
+    "canine",
+    "feline",
+    "equine",
+)
+_NOISE_TITLE_TERMS_DDI = _NOISE_TITLE_TERMS + ("drug-drug interaction", "drug interaction", " ddi ")
 # Score threshold: drop articles below this
 _SCORE_THRESHOLD = 3
 
@@ -92,29 +145,49 @@ _OFFICIAL_SOURCES_OMEPRAZOLE = (
 )
 
 
+def _keyword_hits(text: str) -> Set[str]:
+    """Scoring keywords present in already-lowercased text (substring match, as in _score_source)."""
+    if not text:
+        return set()
+    return {kw for kw in _SCAN_KEYWORDS if kw in text}
+
+
+@lru_cache(maxsize=64)
+def _inn_regexes(inn_l: str) -> Tuple["re.Pattern[str]", "re.Pattern[str]"]:
+    """(exact INN token, "effect(s) of <inn>") patterns for _score_source, compiled once per INN."""
+    inn_re = re.escape(inn_l)
+    return re.compile(r"\b" + inn_re + r"\b", re.I), re.compile(r"effect(s)?\s+of\s+" + inn_re, re.I)
+
+
 def _parse_ref_id(ref: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """Parse ref_id into (id_type, id_value, normalized_ref_id). Returns (None,None,None) if invalid."""
     s = (ref or "").strip()
     if not s:
         return None, None, None
-    u = s.upper()
-    if u.startswith("PMCID:"):
-        raw = s.split(":", 1)[1].strip().lstrip("PMC")
+    m = _REF_PREFIX_RE.match(s)
+    prefix = m.group(1).upper() if m else None
+    if prefix == "PMCID":
+        raw = s[m.end() :].strip().lstrip("PMC")
         return "PMCID", raw, f"PMCID:{raw}" if raw else (None, None, None)
-    if u.startswith("PMID:"):
-        raw = s.split(":", 1)[1].strip()
+    if prefix == "PMID":
+        raw = s[m.end() :].strip()
         return "PMID", raw, f"PMID:{raw}" if raw else (None, None, None)
-    if u.startswith("URL:") or s.startswith("http://") or s.startswith("https://"):
-        url = s.split(":", 1)[1].strip() if u.startswith("URL:") else s
+    if prefix == "URL":
+        url = s[m.end() :].strip()
         return "URL", url, f"URL:{url}"
-    if s.isdigit():
-        return "PMID", s, f"PMID:{s}"
-    return "PMID", s, f"PMID:{s}"  # legacy: treat as PMID
+    if s.startswith(("http://", "https://")):
+        return "URL", s, f"URL:{s}"
+    return "PMID", s, f"PMID:{s}"  # numeric, or legacy: treat as PMID
 
 
 def _get_official_sources(inn: str) -> List[SourceCandidate]:
     """Return 4 official/regulatory sources (id_type=URL). Always included in /search_sources."""
-    inn_lower = (inn or "").strip().lower()
+    # Fresh copies, so callers may modify them without touching the cached candidates.
+    return [cand.model_copy() for cand in _official_sources_for((inn or "").strip().lower())]
+
+
+@lru_cache(maxsize=128)
+def _official_sources_for(inn_lower: str) -> Tuple[SourceCandidate, ...]:
     if inn_lower == "omeprazole":
         items = _OFFICIAL_SOURCES_OMEPRAZOLE
     else:
@@ -126,7 +199,7 @@ def _get_official_sources(inn: str) -> List[SourceCandidate]:
             (f"DailyMed ({inn_lower})", f"https://dailymed.nlm.nih.gov/dailymed/search.cfm?query={enc}"),
             (f"BNF (NICE) {inn_lower} dosing", f"https://bnf.nice.org.uk/search/?q={enc}"),
         )
-    return [
+    return tuple(
         SourceCandidate(
             id_type="URL",
             id=url,
@@ -136,7 +209,29 @@ def _get_official_sources(inn: str) -> List[SourceCandidate]:
             journal=None,
         )
         for title, url in items
-    ]
+    )
+
+
+class _PostedIds:
+    """An id list uploaded to the NCBI History Server on first use; its pages share one EPost."""
+
+    def __init__(self, client: "PubMedClient", db: str, ids: List[str]) -> None:
+        self._client = client
+        self.db = db
+        self.ids = ids
+        self.digest = hashlib.sha1(",".join(sorted(ids)).encode("utf-8")).hexdigest()
+        self._lock = threading.Lock()
+        self._history: Optional[Dict[str, str]] = None
+
+    def history_params(self) -> Dict[str, str]:
+        with self._lock:
+            if self._history is None:
+                self._history = self._client._epost(self.db, self.ids)
+            return self._history
+
+
+# (posted id set, retstart) for one History Server page.
+_HistoryPage = Tuple[_PostedIds, int]
 
 
 class PubMedClient:
@@ -144,6 +239,9 @@ class PubMedClient:
         self.config = config
         self.cache = get_cache(config.cache_dir)
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+        # Лимит NCBI: без API-ключа 3 req/s, с ключом — 10 req/s. Limiter общий для процесса (и для
+        # pmc_fetcher), поэтому параллельные запросы тоже укладываются в лимит; ответы из кэша его не тратят.
+        self._rate_limiter = ncbi_rate_limiter(config.ncbi_api_key)
 
     def _common_params(self) -> Dict[str, str]:
         params: Dict[str, str] = {"tool": self.config.ncbi_tool}
@@ -153,16 +251,106 @@ class PubMedClient:
             params["api_key"] = self.config.ncbi_api_key
         return params
 
-    def _throttle(self) -> None:
-        """Задержка перед запросом к NCBI: без API-ключа лимит 3 req/s, с ключом — 10 req/s."""
-        if not self.config.ncbi_api_key:
-            time.sleep(0.35)
-        else:
-            time.sleep(0.11)
+    def _per_id_cached(
+        self,
+        kind: str,
+        fetch: Callable[[str, List[str], Optional[_HistoryPage]], Dict[str, Any]],
+        db: str,
+        ids: List[str],
+    ) -> Dict[str, Any]:
+        """Look ids up in the per-id cache and fetch only the rest (sorted, so the request is cached
+        regardless of id order). Results come back in requested-id order, then any keyed differently."""
+        wanted = list(dict.fromkeys(ids))
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for id_ in wanted:
+            hit = self.cache.get(f"{kind}:{db}:{id_}")
+            if hit is None:
+                missing.append(id_)
+            else:
+                found[id_] = hit
+        fresh = self._in_batches(fetch, db, sorted(missing)) if missing else {}
+        for key, value in fresh.items():
+            self.cache.set(f"{kind}:{db}:{key}", value, expire=_PER_ID_TTL_SECONDS)
+        result: Dict[str, Any] = {}
+        for id_ in wanted:
+            if id_ in found:
+                result[id_] = found[id_]
+            elif id_ in fresh:
+                result[id_] = fresh[id_]
+        for key, value in fresh.items():
+            result.setdefault(key, value)
+        return result
+
+    def _in_batches(
+        self, fetch: Callable[[str, List[str], Optional[_HistoryPage]], Dict[str, Any]], db: str, ids: List[str]
+    ) -> Dict[str, Any]:
+        """fetch(db, ids) for short lists; otherwise one EPost and fetch per page, merged in page order."""
+        if len(ids) <= _EUTILS_BATCH_SIZE:
+            return fetch(db, ids, None)
+        posted = _PostedIds(self, db, ids)
+        starts = range(0, len(ids), _EUTILS_BATCH_SIZE)
+        merged: Dict[str, Any] = {}
+        with ThreadPoolExecutor(max_workers=min(_BATCH_WORKERS, len(starts))) as pool:
+            pages = pool.map(
+                lambda start: fetch(db, ids[start : start + _EUTILS_BATCH_SIZE], (posted, start)), starts
+            )
+            for part in pages:
+                merged.update(part)
+        return merged
+
+    @staticmethod
+    def _batch_params(
+        base: Dict[str, Any], ids: List[str], page: Optional[_HistoryPage]
+    ) -> Tuple[Params, Optional[Dict[str, Any]]]:
+        """(params to send, cache_params) for one ESummary/EFetch batch.
+
+        Short lists are sent as id=...; History Server pages are cached under the posted id set and
+        page offset rather than the WebEnv, so they stay cacheable across sessions. Their params are
+        built lazily by the request helper, so EPost only happens once some page misses the cache.
+        """
+        if page is None:
+            return {**base, "id": ",".join(ids)}, None
+        posted, start = page
+        page_params = {"retstart": start, "retmax": len(ids)}
+        cache_params = {**base, "id_set_sha1": posted.digest, **page_params}
+        return lambda: {**base, **posted.history_params(), **page_params}, cache_params
+
+    def _epost(self, db: str, ids: List[str]) -> Dict[str, str]:
+        """Upload ids to the NCBI History Server; returns the query_key/WebEnv pair that names them."""
+        url = f"{self.base_url}epost.fcgi"
+        data = {"db": db, "id": ",".join(ids)}
+        data.update(self._common_params())
+        self._rate_limiter.wait()
+        resp = HTTP_SESSION.post(url, data=data, timeout=20)
+        resp.raise_for_status()
+        root = ElementTree.fromstring(resp.content)
+        query_key, web_env = root.findtext("QueryKey"), root.findtext("WebEnv")
+        if not query_key or not web_env:
+            raise ValueError(f"EPost returned no WebEnv for db={db}")
+        return {"query_key": query_key, "WebEnv": web_env}
+
+    @staticmethod
+    def _for_both_dbs(
+        fetch: Callable[[str, List[str]], Dict[str, Any]], pubmed_ids: List[str], pmc_ids: List[str]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """(fetch("pubmed", pubmed_ids), fetch("pmc", pmc_ids)); the two independent calls overlap."""
+        if not pubmed_ids or not pmc_ids:
+            return (
+                fetch("pubmed", pubmed_ids) if pubmed_ids else {},
+                fetch("pmc", pmc_ids) if pmc_ids else {},
+            )
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pmc_future = pool.submit(fetch, "pmc", pmc_ids)
+            return fetch("pubmed", pubmed_ids), pmc_future.result()
 
     def _esearch(self, db: str, term: str, retmax: int) -> List[str]:
         # NCBI E-utilities ESearch (no scraping).
-        self._throttle()
+        url, params = self._esearch_request(db, term, retmax)
+        data = request_json_with_cache(self.cache, url, params, rate_limiter=self._rate_limiter)
+        return data.get("esearchresult", {}).get("idlist", [])
+
+    def _esearch_request(self, db: str, term: str, retmax: int) -> Tuple[str, Dict[str, Any]]:
         url = f"{self.base_url}esearch.fcgi"
         params = {
             "db": db,
@@ -171,27 +359,34 @@ class PubMedClient:
             "retmode": "json",
         }
         params.update(self._common_params())
-        data = request_json_with_cache(self.cache, url, params)
-        return data.get("esearchresult", {}).get("idlist", [])
+        return url, params
+
+    def _esearch_is_cached(self, db: str, term: str, retmax: int) -> bool:
+        url, params = self._esearch_request(db, term, retmax)
+        return response_cache_key(url, params) in self.cache
 
     def _esummary(self, db: str, ids: List[str]) -> Dict[str, Dict[str, str]]:
+        return self._per_id_cached("esummary", self._esummary_batch, db, ids)
+
+    def _esummary_batch(
+        self, db: str, ids: List[str], page: Optional[_HistoryPage] = None
+    ) -> Dict[str, Dict[str, str]]:
         if not ids:
             return {}
-        self._throttle()
         # ESummary returns metadata (title, journal, pubdate).
         url = f"{self.base_url}esummary.fcgi"
-        params = {
+        base = {
             "db": db,
-            "id": ",".join(ids),
             "retmode": "json",
         }
-        params.update(self._common_params())
-        data = request_json_with_cache(self.cache, url, params)
-        result = {}
-        for uid, item in data.get("result", {}).items():
-            if uid == "uids":
-                continue
-            result[uid] = item
+        base.update(self._common_params())
+        params, cache_params = self._batch_params(base, ids, page)
+        data = request_json_with_cache(
+            self.cache, url, params, rate_limiter=self._rate_limiter, cache_params=cache_params
+        )
+        # request_json_with_cache hands back a freshly unpickled/parsed object, so it can be trimmed in place.
+        result = data.get("result", {})
+        result.pop("uids", None)
         return result
 
     def resolve_sources(
@@ -222,8 +417,7 @@ class PubMedClient:
             elif id_type == "URL":
                 ref_order.append(("URL", id_val, norm_ref))
 
-        pubmed_summary = self._esummary("pubmed", pubmed_ids) if pubmed_ids else {}
-        pmc_summary = self._esummary("pmc", pmc_ids) if pmc_ids else {}
+        pubmed_summary, pmc_summary = self._for_both_dbs(self._esummary, pubmed_ids, pmc_ids)
 
         for ref_type, id_val, norm_ref in ref_order:
             if ref_type == "PMID":
@@ -235,6 +429,7 @@ class PubMedClient:
                 pubdate = item.get("pubdate", "")
                 year = self._extract_year(pubdate)
                 journal = normalize_space(item.get("fulljournalname") or item.get("source") or "") or None
+                type_tags, species, feeding, _ = self._classify(title)
                 sources.append(
                     SourceCandidate(
                         id_type="PMID",
@@ -243,9 +438,9 @@ class PubMedClient:
                         title=title or f"PubMed {id_val}",
                         year=int(year) if year else None,
                         journal=journal,
-                        type_tags=self._infer_type_tags(title),
-                        species=self._infer_species(title),
-                        feeding=self._infer_feeding(title),
+                        type_tags=type_tags,
+                        species=species,
+                        feeding=feeding,
                     )
                 )
             elif ref_type == "PMCID":
@@ -257,6 +452,7 @@ class PubMedClient:
                 pubdate = item.get("pubdate", "")
                 year = self._extract_year(pubdate)
                 journal = normalize_space(item.get("fulljournalname") or item.get("source") or "") or None
+                type_tags, species, feeding, _ = self._classify(title)
                 sources.append(
                     SourceCandidate(
                         id_type="PMCID",
@@ -265,9 +461,9 @@ class PubMedClient:
                         title=title or f"PMC {id_val}",
                         year=int(year) if year else None,
                         journal=journal,
-                        type_tags=self._infer_type_tags(title),
-                        species=self._infer_species(title),
-                        feeding=self._infer_feeding(title),
+                        type_tags=type_tags,
+                        species=species,
+                        feeding=feeding,
                     )
                 )
             elif ref_type == "URL":
@@ -326,19 +522,20 @@ class PubMedClient:
     ) -> Tuple[str, List[SourceCandidate], List[str]]:
         warnings: List[str] = []
         sources: List[SourceCandidate] = []
-        seen_ref_ids: set = set()
-        seen_title_year: set = set()
+        # ref_id strings and (title prefix, year) tuples share one set; they can never collide.
+        seen: set = set()
+        allow_ddi = mode == "ddi"
         used_query = ""
 
-        def _dedupe_add(candidate: SourceCandidate) -> None:
-            if candidate.ref_id in seen_ref_ids:
+        def _dedupe_add(candidate: SourceCandidate, is_noise: bool) -> None:
+            # Titles are normalize_space()d when candidates are built.
+            ref_id = candidate.ref_id
+            key = (candidate.title.lower()[:120], candidate.year)
+            if ref_id in seen or key in seen:
                 return
-            key = (normalize_space(candidate.title).lower()[:120], candidate.year)
-            if key in seen_title_year:
-                return
-            seen_ref_ids.add(candidate.ref_id)
-            seen_title_year.add(key)
-            if self._is_noise_title(candidate.title, allow_ddi=(mode == "ddi")):
+            seen.add(ref_id)
+            seen.add(key)
+            if is_noise:
                 return
             sources.append(candidate)
 
@@ -347,191 +544,217 @@ class PubMedClient:
             warnings.append("INN is empty.")
             return "", sources, warnings
 
-        # Step A (high precision): INN in title or MeSH major
-        query_a = self._build_pubmed_query_step_a(inn_clean)
-        pubmed_ids = self._esearch("pubmed", query_a, retmax)
-        used_query = query_a
+        # The PMC leg (single query: title/abstract + thematic + anti) does not depend on PubMed
+        # results, so its ESearch + ESummary run while Steps A/B are in flight. Leaving the block waits
+        # for both background requests, so neither outlives a failing Step A.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            pmc_query = self._build_pmc_query(inn_clean)
+            pmc_future = pool.submit(self._search_pmc_leg, pmc_query, retmax)
 
-        # Step B (expansion) if Step A returned too few
-        if len(pubmed_ids) < _MIN_RESULTS_STEP_A:
+            query_a = self._build_pubmed_query_step_a(inn_clean)
             query_b = self._build_pubmed_query_step_b(inn_clean)
-            ids_b = self._esearch("pubmed", query_b, retmax)
-            seen_pmid = set(pubmed_ids)
-            for pid in ids_b:
-                if pid not in seen_pmid:
-                    pubmed_ids.append(pid)
-                    seen_pmid.add(pid)
-            used_query = query_b
-            if ids_b:
-                warnings.append("Step B (title/abstract) was used to expand results.")
-
-        if not pubmed_ids:
-            warnings.append("No PubMed records found (Step A and B).")
-
-        pubmed_summary = self._esummary("pubmed", pubmed_ids)
-        for pmid, item in pubmed_summary.items():
+            # Step B is only used when Step A comes back sparse. With an API key (10 req/s) and Step A going
+            # to the network, Step B is requested alongside it, so a sparse Step A costs one round-trip
+            # instead of two. Without a key the extra, usually unused, request would hold a 0.35 s limiter
+            # slot ahead of Step A, so Step B stays a sequential fallback.
+            step_b_future = None
+            if self.config.ncbi_api_key and not self._esearch_is_cached("pubmed", query_a, retmax):
+                step_b_future = pool.submit(self._esearch, "pubmed", query_b, retmax)
+
+            # Step A (high precision): INN in title or MeSH major
+            pubmed_ids = self._esearch("pubmed", query_a, retmax)
+            used_query = query_a
+
+            # Step B (expansion) if Step A returned too few
+            if len(pubmed_ids) < _MIN_RESULTS_STEP_A:
+                if step_b_future is not None:
+                    ids_b = step_b_future.result()
+                else:
+                    ids_b = self._esearch("pubmed", query_b, retmax)
+                seen_pmid = set(pubmed_ids)
+                for pid in ids_b:
+                    if pid not in seen_pmid:
+                        pubmed_ids.append(pid)
+                        seen_pmid.add(pid)
+                used_query = query_b
+                if ids_b:
+                    warnings.append("Step B (title/abstract) was used to expand results.")
+
+            if not pubmed_ids:
+                warnings.append("No PubMed records found (Step A and B).")
+
+            pubmed_summary = self._esummary("pubmed", pubmed_ids)
+            for pmid, item in pubmed_summary.items():
+                title = normalize_space(item.get("title", ""))
+                pubdate = item.get("pubdate", "")
+                year = self._extract_year(pubdate)
+                type_tags, species, feeding, is_noise = self._classify(title, allow_ddi=allow_ddi)
+                journal = normalize_space(item.get("fulljournalname") or item.get("source") or "")
+                _dedupe_add(
+                    SourceCandidate(
+                        id_type="PMID",
+                        id=str(pmid),
+                        url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+                        title=title,
+                        year=int(year) if year else None,
+                        journal=journal or None,
+                        type_tags=type_tags,
+                        species=species,
+                        feeding=feeding,
+                    ),
+                    is_noise,
+                )
+
+            # PMC: single query (title/abstract + thematic + anti)
+            pmc_ids, pmc_summary = pmc_future.result()
+        if not pubmed_ids and not pmc_ids:
+            warnings.append("No PubMed/PMC records found via E-utilities.")
+
+        for pmcid, item in pmc_summary.items():
             title = normalize_space(item.get("title", ""))
             pubdate = item.get("pubdate", "")
             year = self._extract_year(pubdate)
-            type_tags = self._infer_type_tags(title)
-            species = self._infer_species(title)
-            feeding = self._infer_feeding(title)
-            journal = normalize_space(item.get("fulljournalname") or item.get("source") or "")
+            type_tags, species, feeding, is_noise = self._classify(title, allow_ddi=allow_ddi)
             _dedupe_add(
                 SourceCandidate(
-                    id_type="PMID",
-                    id=str(pmid),
-                    url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+                    id_type="PMCID",
+                    id=str(pmcid).lstrip("PMC"),
+                    url=f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmcid}/",
                     title=title,
                     year=int(year) if year else None,
-                    journal=journal or None,
+                    journal=normalize_space(item.get("fulljournalname") or item.get("source") or "") or None,
                     type_tags=type_tags,
                     species=species,
                     feeding=feeding,
-                )
-            )
-
-        # PMC: single query (title/abstract + thematic + anti)
-        pmc_query = self._build_pmc_query(inn_clean)
-        pmc_ids = self._esearch("pmc", pmc_query, retmax)
-        if not pubmed_ids and not pmc_ids:
-            warnings.append("No PubMed/PMC records found via E-utilities.")
-
-        pmc_summary = self._esummary("pmc", pmc_ids)
-        for pmcid, item in pmc_summary.items():
-            title = normalize_space(item.get("title", ""))
-            pubdate = item.get("pubdate", "")
-            year = self._extract_year(pubdate)
-            type_tags = self._infer_type_tags(title)
-            species = self._infer_species(title)
-            feeding = self._infer_feeding(title)
-            if self._is_noise_title(title, allow_ddi=(mode == "ddi")):
-                continue
-            key = (title.lower()[:120], int(year) if year else None)
-            if key in seen_title_year:
-                continue
-            cand = SourceCandidate(
-                id_type="PMCID",
-                id=str(pmcid).lstrip("PMC"),
-                url=f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmcid}/",
-                title=title,
-                year=int(year) if year else None,
-                journal=normalize_space(item.get("fulljournalname") or item.get("source") or "") or None,
-                type_tags=type_tags,
-                species=species,
-                feeding=feeding,
+                ),
+                is_noise,
             )
-            if cand.ref_id in seen_ref_ids:
-                continue
-            seen_ref_ids.add(cand.ref_id)
-            seen_title_year.add(key)
-            sources.append(cand)
 
         # Rank: fetch abstracts, score, filter by threshold, sort (score desc, year desc)
         if sources:
+            # Parallel columns indexed like sources; only the surviving indices are sorted.
             ref_ids = [s.ref_id for s in sources]
             abstracts_map = self.fetch_abstracts(ref_ids)
-            scored: List[Tuple[int, SourceCandidate]] = []
-            for s in sources:
-                abstract = abstracts_map.get(s.ref_id) or ""
-                sc = self._score_source(s.title, abstract, inn_clean, s.species)
-                if sc >= _SCORE_THRESHOLD:
-                    scored.append((sc, s))
-            scored.sort(key=lambda x: (-x[0], -(x[1].year or 0)))
-            sources = [cand for _, cand in scored]
+            scores = self._score_sources(
+                [s.title for s in sources],
+                [abstracts_map.get(ref_id) or "" for ref_id in ref_ids],
+                inn_clean,
+                [s.species for s in sources],
+                threshold=_SCORE_THRESHOLD,
+            )
+            years = [s.year or 0 for s in sources]
+            keep = [i for i, sc in enumerate(scores) if sc >= _SCORE_THRESHOLD]
+            keep.sort(key=lambda i: (-scores[i], -years[i]))
+            sources = [sources[i] for i in keep]
 
         # Official/regulatory sources (always appended; id_type=URL)
         sources.extend(_get_official_sources(inn_clean))
 
         return used_query, sources, warnings
 
+    def _search_pmc_leg(self, pmc_query: str, retmax: int) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+        pmc_ids = self._esearch("pmc", pmc_query, retmax)
+        return pmc_ids, self._esummary("pmc", pmc_ids)
+
+    @classmethod
+    def _classify(
+        cls, title: str, *, allow_ddi: bool = False
+    ) -> Tuple[List[str], Optional[str], Optional[str], bool]:
+        """(type_tags, species, feeding, is_noise) for a title, lowercased once for all helpers."""
+        title_l = (title or "").lower()
+        return (
+            cls._infer_type_tags(title_l),
+            cls._infer_species(title_l),
+            cls._infer_feeding(title_l),
+            cls._is_noise_title(title_l, allow_ddi=allow_ddi),
+        )
+
     @staticmethod
-    def _is_noise_title(title: str, *, allow_ddi: bool = False) -> bool:
+    def _is_noise_title(title_l: str, *, allow_ddi: bool = False) -> bool:
         """Exclude DDI, phenotyping, cocktail/probe, microdose, veterinary (post-filter backup).
         When allow_ddi=True (mode=ddi), drug interaction terms are not treated as noise."""
-        t = (title or "").lower()
-        noise = [
-            "phenotyping",
-            "phenotype",
-            "cocktail",
-            "probe drug",
-            "probe drugs",
-            "microdose",
-            "veterinary",
-            " in rats",
-            " in mice",
-            " in dogs",
-            " in pigs",
-            " in horse",
-            "rat ",
-            "mouse ",
-            "canine",
-            "feline",
-            "equine",
-        ]
-        if not allow_ddi:
-            noise.extend(("drug-drug interaction", "drug interaction", " ddi "))
-        return any(n in t for n in noise)
+        noise = _NOISE_TITLE_TERMS if allow_ddi else _NOISE_TITLE_TERMS_DDI
+        return any(n in title_l for n in noise)
 
-    @staticmethod
+    @classmethod
     def _score_source(
+        cls,
         title: str,
         abstract: str,
         inn: str,
         species: Optional[str],
     ) -> int:
         """Score a source: plus for INN/theme/must, minus for anti/other-drug/animal. Returns total."""
-        t = (title or "").lower()
-        a = (abstract or "").lower()
-        inn_l = (inn or "").strip().lower()
-        score = 0
+        return cls._score_sources([title], [abstract], inn, [species])[0]
 
-        # +10 INN in title (exact token)
+    @staticmethod
+    def _score_sources(
+        titles: List[str],
+        abstracts: List[str],
+        inn: str,
+        species_list: List[Optional[str]],
+        threshold: Optional[int] = None,
+    ) -> List[int]:
+        """_score_source over parallel columns; the INN and its patterns are resolved once per batch.
+
+        With a threshold, a source whose title alone already keeps it below the threshold (even with
+        every abstract bonus) gets its title-only score and its abstract is never scanned.
+        """
+        inn_l = (inn or "").strip().lower()
         if inn_l:
-            token_re = re.compile(r"\b" + re.escape(inn_l) + r"\b", re.I)
-            if token_re.search(t):
-                score += 10
-            # +5 INN in title (partial/variant)
-            elif inn_l in t:
-                score += 5
-
-        # +3 per theme keyword in title, +1 in abstract
-        for kw in _THEME_KEYWORDS:
-            if kw in t:
-                score += 3
-            if kw in a:
-                score += 1
-
-        # +2 if any must-keyword (delayed-release/enteric/dissolution)
-        for kw in _MUST_KEYWORDS:
-            if kw in t or kw in a:
+            token_re, effect_re = _inn_regexes(inn_l)
+        scores: List[int] = []
+        for title, abstract, species in zip(titles, abstracts, species_list):
+            t = (title or "").lower()
+            score = 0
+
+            # +10 INN in title (exact token)
+            if inn_l:
+                if token_re.search(t):
+                    score += 10
+                # +5 INN in title (partial/variant)
+                elif inn_l in t:
+                    score += 5
+
+            title_hits = _keyword_hits(t)
+            title_must = not _MUST_SET.isdisjoint(title_hits)
+            title_anti = not _ANTI_SET.isdisjoint(title_hits)
+            animal = species == "animal" or not _ANIMAL_SET.isdisjoint(title_hits)
+
+            # +3 per theme keyword in title
+            score += 3 * len(title_hits & _THEME_SET)
+            # +2 if any must-keyword (delayed-release/enteric/dissolution)
+            if title_must:
                 score += 2
-                break
-
-        # -10 anti in title
-        for kw in _ANTI_KEYWORDS:
-            if kw in t:
+            # -10 anti in title
+            if title_anti:
+                score -= 10
+            # -10 title like "<other drug> ... effect of <inn> ..." (INN as modifier)
+            if inn_l and "pharmacokinetics" in t and effect_re.search(t):
                 score -= 10
-                break
-        # -5 anti only in abstract (if not already -10 from title)
-        if not any(kw in t for kw in _ANTI_KEYWORDS):
-            for kw in _ANTI_KEYWORDS:
-                if kw in a:
-                    score -= 5
-                    break
-
-        # -10 title like "<other drug> ... effect of <inn> ..." (INN as modifier)
-        if inn_l and "pharmacokinetics" in t and re.search(
-            r"effect(s)?\s+of\s+" + re.escape(inn_l), t, re.I
-        ):
-            score -= 10
-
-        # -20 animal study (once)
-        animal_markers = (" in rats", " in mice", " in dogs", "veterinary", " in healthy horses")
-        if species == "animal" or any(m in t for m in animal_markers) or any(m in a for m in animal_markers):
-            score -= 20
-
-        return score
+            # -20 animal study (once)
+            if animal:
+                score -= 20
+
+            # The abstract can add at most +1 per theme keyword and the must bonus; the rest only subtracts.
+            max_abstract_bonus = len(_THEME_SET) + (0 if title_must else 2)
+            if threshold is not None and score + max_abstract_bonus < threshold:
+                scores.append(score)
+                continue
+
+            abstract_hits = _keyword_hits((abstract or "").lower())
+            # +1 per theme keyword in abstract
+            score += len(abstract_hits & _THEME_SET)
+            if not title_must and not _MUST_SET.isdisjoint(abstract_hits):
+                score += 2
+            # -5 anti only in abstract (if not already -10 from title)
+            if not title_anti and not _ANTI_SET.isdisjoint(abstract_hits):
+                score -= 5
+            if not animal and not _ANIMAL_SET.isdisjoint(abstract_hits):
+                score -= 20
+
+            scores.append(score)
+        return scores
 
     def fetch_abstracts(self, ids: List[str]) -> Dict[str, str]:
         # Accept ref_id: PMID:123 or PMCID:123 (or legacy numeric / PMCID:x)
@@ -541,91 +764,116 @@ class PubMedClient:
             if not i:
                 continue
             s = i.strip()
-            if s.upper().startswith("PMCID:"):
-                pmc_ids.append(s.split(":", 1)[1].strip().lstrip("PMC"))
-            elif s.upper().startswith("PMID:"):
-                pubmed_ids.append(s.split(":", 1)[1].strip())
-            elif s.upper().startswith("URL:"):
+            m = _REF_PREFIX_RE.match(s)
+            prefix = m.group(1).upper() if m else None
+            if prefix == "PMCID":
+                pmc_ids.append(s[m.end() :].strip().lstrip("PMC"))
+            elif prefix == "PMID":
+                pubmed_ids.append(s[m.end() :].strip())
+            elif prefix == "URL":
                 continue  # official/regulatory URLs: no abstract from NCBI
-            elif s.isdigit():
-                pubmed_ids.append(s)
             else:
-                pubmed_ids.append(s)
+                pubmed_ids.append(s)  # numeric, or legacy: treat as PMID
         # PMC ids from API are numeric; strip PMC prefix if present
         pmc_ids = [x.lstrip("PMC") for x in pmc_ids]
 
         abstracts: Dict[str, str] = {}
-        if pubmed_ids:
-            raw_pubmed = self._efetch_abstracts("pubmed", pubmed_ids)
-            for pid, text in raw_pubmed.items():
-                abstracts[f"PMID:{pid}"] = text
-        if pmc_ids:
-            pmc_abstracts = self._efetch_abstracts("pmc", pmc_ids)
-            for pmcid, text in pmc_abstracts.items():
-                # PMC XML may return numeric or PMC-prefixed id
-                n = str(pmcid).lstrip("PMC")
-                abstracts[f"PMCID:{n}"] = text
+        raw_pubmed, pmc_abstracts = self._for_both_dbs(self._efetch_abstracts, pubmed_ids, pmc_ids)
+        for pid, text in raw_pubmed.items():
+            abstracts[f"PMID:{pid}"] = text
+        for pmcid, text in pmc_abstracts.items():
+            # PMC XML may return numeric or PMC-prefixed id
+            n = str(pmcid).lstrip("PMC")
+            abstracts[f"PMCID:{n}"] = text
         return abstracts
 
     def _efetch_abstracts(self, db: str, ids: List[str]) -> Dict[str, str]:
+        return self._per_id_cached("efetch_abstract", self._efetch_abstracts_batch, db, ids)
+
+    def _efetch_abstracts_batch(
+        self, db: str, ids: List[str], page: Optional[_HistoryPage] = None
+    ) -> Dict[str, str]:
         if not ids:
             return {}
-        self._throttle()
         # EFetch returns abstracts/full records in XML.
         # Для PubMed abstract возвращается при rettype=abstract.
         # Для PMC без rettype=full NCBI отдаёт DocSum/Medline — тегов <article>/<abstract> нет.
         url = f"{self.base_url}efetch.fcgi"
-        params = {
+        base = {
             "db": db,
-            "id": ",".join(ids),
             "retmode": "xml",
         }
         if db == "pubmed":
-            params["rettype"] = "abstract"
+            base["rettype"] = "abstract"
         elif db == "pmc":
-            params["rettype"] = "full"  # JATS XML с <article> и <abstract>
-        params.update(self._common_params())
-        text = request_text_with_cache(self.cache, url, params)
-        return self._parse_abstracts_xml(text)
+            base["rettype"] = "full"  # JATS XML с <article> и <abstract>
+        base.update(self._common_params())
+        params, cache_params = self._batch_params(base, ids, page)
+        with request_stream_with_cache(
+            self.cache, url, params, rate_limiter=self._rate_limiter, cache_params=cache_params
+        ) as stream:
+            return self._parse_abstracts_stream(stream)
 
     def _parse_abstracts_xml(self, xml_text: str) -> Dict[str, str]:
-        abstracts: Dict[str, str] = {}
+        if not xml_text or "<" not in xml_text[:1024]:
+            return {}
+        return self._parse_abstracts_stream(BytesIO(xml_text.encode("utf-8")), encoding="utf-8")
+
+    def _parse_abstracts_stream(self, stream: IO[bytes], encoding: Optional[str] = None) -> Dict[str, str]:
+        # Stream records and free each one once read; multi-record EFetch bodies never sit in memory
+        # as a whole tree. PubMed records are listed before PMC ones, as with separate passes.
+        pubmed_abstracts: Dict[str, str] = {}
+        pmc_abstracts: Dict[str, str] = {}
         try:
-            root = ElementTree.fromstring(xml_text)
+            for _, article in ElementTree.iterparse(
+                stream,
+                events=("end",),
+                tag=("PubmedArticle", "article"),
+                encoding=encoding,
+                huge_tree=True,
+            ):
+                if article.tag == "PubmedArticle":
+                    pmid_node = article.find(".//PMID")
+                    if pmid_node is not None:
+                        abstract_nodes = article.findall(".//AbstractText")
+                        pmid = pmid_node.text or ""
+                        pubmed_abstracts[pmid] = " ".join([normalize_space(n.text or "") for n in abstract_nodes])
+                else:
+                    # PMC XML includes <article-id pub-id-type="pmc">PMCID</article-id>. One tag-filtered
+                    # descent finds it and every <abstract>, instead of two full-subtree XPath walks.
+                    pmc_id_node = None
+                    abstract_nodes = []
+                    for node in article.iter("article-id", "abstract"):
+                        if node.tag == "abstract":
+                            abstract_nodes.extend(node.iter("p"))
+                        elif pmc_id_node is None and node.get("pub-id-type") == "pmc":
+                            pmc_id_node = node
+                    if pmc_id_node is not None:
+                        pmc_id = pmc_id_node.text or ""
+                        pmc_abstracts[pmc_id] = " ".join([normalize_space(n.text or "") for n in abstract_nodes])
+                parent = article.getparent()
+                if parent is not None and parent.getparent() is None:
+                    # Top-level record (child of the *ArticleSet root): drop it and everything before it.
+                    article.clear(keep_tail=True)
+                    while article.getprevious() is not None:
+                        del parent[0]
         except Exception:
-            return abstracts
+            return {}
 
-        for article in root.findall(".//PubmedArticle"):
-            pmid_node = article.find(".//PMID")
-            abstract_nodes = article.findall(".//AbstractText")
-            if pmid_node is None:
-                continue
-            pmid = pmid_node.text or ""
-            abstract = " ".join([normalize_space(n.text or "") for n in abstract_nodes])
-            abstracts[pmid] = abstract
-
-        for article in root.findall(".//article"):
-            # PMC XML includes <article-id pub-id-type="pmc">PMCID</article-id>
-            pmc_id_node = article.find(".//article-id[@pub-id-type='pmc']")
-            abstract_nodes = article.findall(".//abstract//p")
-            if pmc_id_node is None:
-                continue
-            pmc_id = pmc_id_node.text or ""
-            abstract = " ".join([normalize_space(n.text or "") for n in abstract_nodes])
+        abstracts = pubmed_abstracts
+        for pmc_id, abstract in pmc_abstracts.items():
             abstracts[pmc_id] = abstract
-
         return abstracts
 
     @staticmethod
     def _extract_year(pubdate: str) -> str | None:
         if not pubdate:
             return None
-        match = re.search(r"(19|20)\d{2}", pubdate)
+        match = _YEAR_RE.search(pubdate)
         return match.group(0) if match else None
 
     @staticmethod
-    def _infer_type_tags(title: str) -> List[str]:
-        title_l = (title or "").lower()
+    def _infer_type_tags(title_l: str) -> List[str]:
         tags: List[str] = []
         if "bioequivalence" in title_l or "bioequivalent" in title_l:
             tags.append("BE")
@@ -636,8 +884,7 @@ class PubMedClient:
         return tags
 
     @staticmethod
-    def _infer_species(title: str) -> Optional[str]:
-        title_l = (title or "").lower()
+    def _infer_species(title_l: str) -> Optional[str]:
         if "rat" in title_l or "mouse" in title_l or "animal" in title_l:
             return "animal"
         if "human" in title_l or "healthy" in title_l:
@@ -645,8 +892,7 @@ class PubMedClient:
         return None
 
     @staticmethod
-    def _infer_feeding(title: str) -> Optional[str]:
-        title_l = (title or "").lower()
+    def _infer_feeding(title_l: str) -> Optional[str]:
         if "fasted" in title_l:
             return "fasted"
         if "fed" in title_l:
@@ -2,14 +2,17 @@
 
 import json
 import os
-import re
+import tempfile
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import IO, Any, Callable, Dict, Optional, Union
 
 import requests
 import structlog
 from diskcache import Cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 @dataclass
@@ -44,22 +47,92 @@ def configure_logging() -> structlog.BoundLogger:
     return structlog.get_logger()
 
 
+def _build_http_session() -> requests.Session:
+    session = requests.Session()
+    # Ask for compressed bodies explicitly; E-utilities XML shrinks several-fold with gzip.
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    # Pool keep-alive connections to eutils and retry throttling/server errors with backoff. The last
+    # response is returned rather than raised, so callers keep their own status handling.
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry))
+    return session
+
+
+# Shared by every NCBI caller so TCP/TLS connections are reused across modules.
+HTTP_SESSION = _build_http_session()
+
+
+class RateLimiter:
+    """Spaces calls from any thread at least `interval` seconds apart.
+
+    Callers reserve the next free slot before their request and only sleep when the previous
+    reservation is still in the future, so idle gaps between requests cost nothing.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+# NCBI E-utilities: 3 requests/s without an API key, 10 requests/s with one (small safety margin).
+_NCBI_LIMITERS = {False: RateLimiter(0.35), True: RateLimiter(0.11)}
+
+
+def ncbi_rate_limiter(api_key: Optional[str]) -> RateLimiter:
+    """Process-wide limiter for E-utilities calls made with (or without) an API key."""
+    return _NCBI_LIMITERS[bool(api_key)]
+
+
 def get_cache(cache_dir: str) -> Cache:
     os.makedirs(cache_dir, exist_ok=True)
     return Cache(cache_dir)
 
 
+# Request params, or a callable building them; a callable (which needs cache_params for the key) is
+# only called when the request actually goes out, e.g. to create an NCBI WebEnv lazily.
+Params = Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+
+
+def response_cache_key(url: str, params: Dict[str, Any], stream: bool = False) -> str:
+    """Cache key the request_*_with_cache helpers store a response under."""
+    key: Dict[str, Any] = {"url": url, "params": params}
+    if stream:
+        key["stream"] = True
+    return json.dumps(key, sort_keys=True)
+
+
 def request_json_with_cache(
     cache: Cache,
     url: str,
-    params: Dict[str, Any],
+    params: Params,
     ttl_seconds: int = 3600,
     timeout: int = 20,
+    rate_limiter: Optional[RateLimiter] = None,
+    cache_params: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    key = json.dumps({"url": url, "params": params}, sort_keys=True)
+    """GET JSON through the cache; rate_limiter (if any) is only waited on when the request goes out.
+
+    cache_params, when given, identify the response in the cache instead of the params actually sent
+    (for requests carrying session-specific values such as an NCBI WebEnv); params may then be a
+    callable, resolved only on a miss.
+    """
+    key = response_cache_key(url, params if cache_params is None else cache_params)
     if key in cache:
         return cache[key]
-    resp = requests.get(url, params=params, timeout=timeout)
+    if callable(params):
+        params = params()
+    if rate_limiter is not None:
+        rate_limiter.wait()
+    resp = HTTP_SESSION.get(url, params=params, timeout=timeout)
     resp.raise_for_status()
     data = resp.json()
     cache.set(key, data, expire=ttl_seconds)
@@ -72,19 +145,111 @@ def request_text_with_cache(
     params: Dict[str, Any],
     ttl_seconds: int = 3600,
     timeout: int = 20,
+    rate_limiter: Optional[RateLimiter] = None,
 ) -> str:
-    key = json.dumps({"url": url, "params": params}, sort_keys=True)
+    """GET text through the cache; rate_limiter (if any) is only waited on when the request goes out."""
+    key = response_cache_key(url, params)
     if key in cache:
         return cache[key]
-    resp = requests.get(url, params=params, timeout=timeout)
+    if rate_limiter is not None:
+        rate_limiter.wait()
+    resp = HTTP_SESSION.get(url, params=params, timeout=timeout)
     resp.raise_for_status()
     text = resp.text
     cache.set(key, text, expire=ttl_seconds)
     return text
 
 
+def request_stream_with_cache(
+    cache: Cache,
+    url: str,
+    params: Params,
+    ttl_seconds: int = 3600,
+    timeout: int = 20,
+    rate_limiter: Optional[RateLimiter] = None,
+    cache_params: Optional[Dict[str, Any]] = None,
+) -> IO[bytes]:
+    """Like request_text_with_cache, but returns the raw body as a binary file the caller must close.
+
+    Cache hits are read back from disk. On a miss the caller reads the decoded response while it is
+    still arriving (so parsing overlaps the download); the bytes are spooled as they pass and stored
+    in the cache on close, if the body was read to the end. Large bodies never sit in memory as one
+    string. rate_limiter (if any) is only waited on for misses; cache_params work as in
+    request_json_with_cache.
+    """
+    key = response_cache_key(url, params if cache_params is None else cache_params, stream=True)
+    handle = cache.get(key, read=True)
+    if handle is not None:
+        return handle
+    if callable(params):
+        params = params()
+    if rate_limiter is not None:
+        rate_limiter.wait()
+    resp = HTTP_SESSION.get(url, params=params, timeout=timeout, stream=True)
+    try:
+        resp.raise_for_status()
+    except Exception:
+        resp.close()
+        raise
+    resp.raw.decode_content = True
+    return _CachingResponseReader(resp, cache, key, ttl_seconds)
+
+
+class _CachingResponseReader:
+    """Read-only binary file over a streamed response that copies everything it reads into a spool file."""
+
+    _SPOOL_IN_MEMORY = 1024 * 1024
+
+    def __init__(self, resp: requests.Response, cache: Cache, key: str, ttl_seconds: int) -> None:
+        self._resp = resp
+        self._cache = cache
+        self._key = key
+        self._ttl_seconds = ttl_seconds
+        self._spool = tempfile.SpooledTemporaryFile(max_size=self._SPOOL_IN_MEMORY)
+        self._complete = False
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._resp.raw.read(size if size is not None and size >= 0 else None)
+        if data:
+            self._spool.write(data)
+        if size is None or size < 0 or (size > 0 and not data):
+            self._complete = True
+        return data
+
+    def close(self) -> None:
+        try:
+            if self._complete:
+                self._spool.seek(0)
+                self._cache.set(self._key, self._spool, expire=self._ttl_seconds, read=True)
+        finally:
+            self._spool.close()
+            self._resp.close()
+
+    def __enter__(self) -> "_CachingResponseReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+# ASCII whitespace other than the plain space (what str.split() breaks on below 0x80).
+_ASCII_OTHER_SPACE = "\t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
 def normalize_space(text: str) -> str:
-    return re.sub(r"\s+", " ", text or "").strip()
+    # str.split() breaks on exactly the characters re's \s matches for str, so this equals
+    # re.sub(r"\s+", " ", text).strip() without running the regex engine.
+    text = text or ""
+    # Already-normalized ASCII text comes back as the same object instead of a rebuilt copy.
+    if (
+        text.isascii()
+        and "  " not in text
+        and not text[:1].isspace()
+        and not text[-1:].isspace()
+        and not any(ch in text for ch in _ASCII_OTHER_SPACE)
+    ):
+        return text
+    return " ".join(text.split())
 
 
 def safe_float(text: str) -> Optional[float]:
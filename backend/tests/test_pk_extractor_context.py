@@ -18,3 +18,36 @@ def test_fed_fasted_detection_and_meal_warning():
     extractor.extract(abstracts_fed)
     assert extractor.last_context.get("study_condition") == "fed"
     assert "clarify_meal_composition" in (extractor.last_warnings or [])
+
+
+def test_fused_metric_scan_matches_per_pattern_finditer():
+    extractor = PKExtractor()
+    texts = {
+        "1": (
+            "Cmax = 245 ng/mL, C max: 12.5 mg/L and AUC0-inf 1850 ng*h/mL.AUC0-t 9.8 ngh/mL; "
+            "t1/2 = 9.8 h, half-life 10 hours, Tmax 1.5 h. Intra-subject CV = 22% (CV within-subject 25.5 %). "
+            "lambda z = 0.07 1/h; elimination rate constant 0.1 h^-1. CV intra"
+        ),
+        # Must not pair up with the dangling "CV intra" / "Cmax =" at the end of the neighbours.
+        "2": " = 30% of subjects. Cmax =",
+        "3": "12 ng/mL",
+    }
+    hits = extractor._scan_metrics(texts)
+    for source_id, text in texts.items():
+        expected = [
+            (metric, m.span()) for metric, pattern in extractor.patterns.items() for m in pattern.finditer(text)
+        ]
+        fused = [
+            (metric, (m.start(m.lastgroup) - base, m.end(m.lastgroup) - base))
+            for metric, m, base in hits.get(source_id, [])
+        ]
+        assert fused == expected
+    assert {metric for metric, _, _ in hits["1"]} == set(extractor.patterns)
+
+
+def test_first_match_only_keeps_first_value_per_metric():
+    abstracts = {"126": "Cmax = 10 ng/mL in period 1 and Cmax = 12 ng/mL in period 2."}
+    pk_all, _, _ = PKExtractor().extract(abstracts)
+    pk_first, _, _ = PKExtractor(first_match_only=True).extract(abstracts)
+    assert [pk.value for pk in pk_all if pk.name == "Cmax"] == [10.0, 12.0]
+    assert [pk.value for pk in pk_first if pk.name == "Cmax"] == [10.0]
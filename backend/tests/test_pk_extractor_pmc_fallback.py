@@ -37,3 +37,38 @@ def test_pmc_regex_fallback_cv_extracted():
         assert ci.ci_type == "percent"
         assert abs(ci.ci_low - 80.0) < 1e-6
         assert abs(ci.ci_high - 125.0) < 1e-6
+
+
+def test_pmc_llm_skipped_without_cv_mention():
+    calls = []
+
+    class CountingLLM:
+        def extract_pk_from_text(self, text, inn="", source_id="", location=""):
+            calls.append(location)
+            return {}
+
+    def fake_pmc_fetcher(source_id: str):
+        return {"snippets_text": "", "target_text": "", "full_text": "Tablets were well tolerated.", "warnings": []}
+
+    extractor = PKExtractor(llm_client=CountingLLM(), pmc_fetcher=fake_pmc_fetcher, llm_extractor=None)
+    extractor.extract({"PMCID:10175790": "dummy"}, inn="test")
+    assert calls == []
+
+    def fake_pmc_fetcher_cv(source_id: str):
+        return {"snippets_text": "", "target_text": "", "full_text": "Intra-subject CV was 22%.", "warnings": []}
+
+    extractor = PKExtractor(llm_client=CountingLLM(), pmc_fetcher=fake_pmc_fetcher_cv, llm_extractor=None)
+    extractor.extract({"PMCID:10175790": "dummy"}, inn="test")
+    assert calls == ["full_text"]
+
+
+def test_pmc_fallback_stops_fetching_after_first_cv():
+    fetched = []
+
+    def fake_pmc_fetcher(source_id: str):
+        fetched.append(source_id)
+        return _dummy_pmc_payload()
+
+    extractor = PKExtractor(llm_client=DummyLLM(), pmc_fetcher=fake_pmc_fetcher, llm_extractor=None)
+    extractor.extract({"PMCID:1": "dummy", "PMCID:2": "dummy", "PMCID:3": "dummy"}, inn="test")
+    assert fetched == ["PMCID:1"]
@@ -1,6 +1,9 @@
 import types
 
-from backend.services.pmc_fetcher import build_snippets, fetch_pmc_sections
+from diskcache import Cache
+
+from backend.services import pmc_fetcher
+from backend.services.pmc_fetcher import build_snippets, fetch_pmc_sections, fetch_pmc_sections_bulk
 
 
 class DummyResp:
@@ -38,7 +41,7 @@ def test_pmc_fetcher_extracts_sections_and_tables(monkeypatch):
       <back><ref-list><p>Should be ignored</p></ref-list></back>
     </article>
     """
-    monkeypatch.setattr("requests.get", _mock_get(xml))
+    monkeypatch.setattr(pmc_fetcher._SESSION, "get", _mock_get(xml))
     data = fetch_pmc_sections("PMCID:123")
     assert isinstance(data, dict)
     # snippets should catch CV
@@ -54,3 +57,45 @@ def test_build_snippets_limits_and_locations():
     snips = build_snippets(sections, tables, source_id="PMCID:1")
     assert 1 <= len(snips) <= 20
     assert all("location" in s and s["location"].startswith(("sec:", "table:")) for s in snips)
+
+
+def test_pmc_fetcher_serves_repeat_fetches_from_cache(monkeypatch, tmp_path):
+    calls = []
+
+    def _counting_get(url, params=None, timeout=None):
+        calls.append(params["id"])
+        return DummyResp("<article><body><p>CV was 25%.</p></body></article>", 200)
+
+    monkeypatch.setattr(pmc_fetcher._SESSION, "get", _counting_get)
+    cache = Cache(str(tmp_path))
+    first = fetch_pmc_sections("PMCID:123", cache=cache)
+    second = fetch_pmc_sections("PMCID:123", cache=cache)
+    assert calls == ["123"]
+    assert second == first
+    assert "CV was 25%" in second["full_text"]
+
+
+def test_pmc_fetcher_bulk_keeps_input_order(monkeypatch):
+    def _per_id_get(url, params=None, timeout=None):
+        return DummyResp(f"<article><body><p>Article {params['id']} CV 20%.</p></body></article>", 200)
+
+    monkeypatch.setattr(pmc_fetcher._SESSION, "get", _per_id_get)
+    results = fetch_pmc_sections_bulk(["PMC3", "PMCID:1", "2", ""])
+    assert [r["full_text"] for r in results] == ["Article 3 CV 20%.", "Article 1 CV 20%.", "Article 2 CV 20%.", ""]
+
+
+def test_pmc_fetcher_rejects_truncated_xml(monkeypatch, tmp_path):
+    truncated = "<article><body><sec><title>Results</title><p>Cmax was 12 ng/mL and CV 25%</p><p>AUC was 3"
+    monkeypatch.setattr(pmc_fetcher._SESSION, "get", _mock_get(truncated))
+    cache = Cache(str(tmp_path))
+    result = fetch_pmc_sections("PMCID:123", cache=cache)
+    assert result["full_text"] == ""
+    assert "pmc_sections:PMCID:123" not in cache
+
+
+def test_pmc_fetcher_does_not_cache_efetch_error_reply(monkeypatch, tmp_path):
+    error_body = "<eFetchResult><ERROR>Temporary failure</ERROR></eFetchResult>"
+    monkeypatch.setattr(pmc_fetcher._SESSION, "get", _mock_get(error_body))
+    cache = Cache(str(tmp_path))
+    assert fetch_pmc_sections("PMCID:123", cache=cache)["full_text"] == ""
+    assert "pmc_sections:PMCID:123" not in cache
@@ -0,0 +1,44 @@
+import math
+
+import numpy as np
+
+from backend.services import powertost_runner
+from backend.services.powertost_runner import _t_quantile, cv_from_ci, cv_from_ci_vec, run_cvfromci_batch
+
+
+def test_t_quantile_matches_reference_values():
+    # qt(0.95, df) in R
+    for df, expected in [(1, 6.313752), (2, 2.919986), (10, 1.812461), (22, 1.717144), (100, 1.660234)]:
+        assert math.isclose(_t_quantile(0.95, df), expected, abs_tol=1e-6)
+
+
+def test_cv_from_ci_balanced_2x2_closed_form():
+    lower, upper, n = 0.8323, 1.0392, 24
+    se = (math.log(upper) - math.log(lower)) / 2 / 1.7171444
+    expected = math.sqrt(math.exp(se * se * n / 2) - 1)
+    assert math.isclose(cv_from_ci(lower, upper, n), expected, rel_tol=1e-6)
+    # CIs in percent give the same CV
+    assert math.isclose(cv_from_ci(83.23, 103.92, n), cv_from_ci(lower, upper, n), rel_tol=1e-12)
+
+
+def test_run_cvfromci_batch_in_process_without_rscript(monkeypatch):
+    monkeypatch.delenv("POWERTOST_CVFROMCI_USE_R", raising=False)
+    monkeypatch.setattr(powertost_runner, "_get_rscript_path", lambda: None)
+    results = run_cvfromci_batch(
+        [(0.9, 1.1, 24, "2x2"), (0.9, 1.1, 2, "2x2"), (0.9, 1.1, 24, "3x3"), ("n/a", 1.1, 24, "2x2")]
+    )
+    cv, warnings = results[0]
+    assert 15 < cv < 25 and warnings == ["cv_assumed_fraction"]
+    assert results[1] == (None, ["cvfromci_failed", "cvfromci_invalid"])
+    assert results[2] == (None, ["rscript_not_found"])
+    assert results[3] == (None, ["invalid_parameters"])
+
+
+def test_cv_from_ci_vec_matches_scalar_and_flags_invalid_rows():
+    lower = np.array([0.85, 0.9, -1.0, 0.8])
+    upper = np.array([1.05, 1.1, 1.1, 1.25])
+    n = np.array([24, 25, 24, 2])
+    cvs = cv_from_ci_vec(lower, upper, n, "parallel")
+    for i in range(2):
+        assert math.isclose(cvs[i], cv_from_ci(lower[i], upper[i], n[i], "parallel"), rel_tol=1e-12)
+    assert np.isnan(cvs[2]) and np.isnan(cvs[3])
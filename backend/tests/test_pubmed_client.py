@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from backend.services import pubmed_client
+from backend.services.pubmed_client import PubMedClient
+from backend.services.utils import AppConfig
+
+
+def _client(tmp_path) -> PubMedClient:
+    config = AppConfig(
+        ncbi_api_key=None, ncbi_email=None, ncbi_tool="test", cache_dir=str(tmp_path), log_level="INFO"
+    )
+    return PubMedClient(config)
+
+
+def test_esummary_fetches_only_ids_missing_from_per_id_cache(tmp_path, monkeypatch):
+    requested = []
+
+    def fake_json(cache, url, params, **kwargs):
+        ids = params["id"].split(",")
+        requested.append(ids)
+        result = {"uids": ids}
+        result.update({i: {"title": f"Title {i}"} for i in ids})
+        return {"result": result}
+
+    monkeypatch.setattr(pubmed_client, "request_json_with_cache", fake_json)
+    client = _client(tmp_path)
+
+    first = client._esummary("pubmed", ["3", "1"])
+    second = client._esummary("pubmed", ["2", "3", "1"])
+
+    assert requested == [["1", "3"], ["2"]]
+    assert list(first) == ["3", "1"]
+    assert list(second) == ["2", "3", "1"]
+    assert second["3"] == {"title": "Title 3"}
+
+
+def test_score_sources_threshold_keeps_the_same_survivors():
+    titles = ["Omeprazole bioequivalence in rats", "Omeprazole delayed-release bioequivalence", "cocktail probe"]
+    abstracts = ["tablet capsule auc cmax", "healthy volunteers crossover", "dissolution generic"]
+    species = [None, "human", "animal"]
+    exact = PubMedClient._score_sources(titles, abstracts, "omeprazole", species)
+    early = PubMedClient._score_sources(titles, abstracts, "omeprazole", species, threshold=3)
+    assert [s >= 3 for s in early] == [s >= 3 for s in exact]
+    assert early[1] == exact[1] == PubMedClient._score_source(titles[1], abstracts[1], "omeprazole", "human")
+
+
+def test_long_id_lists_page_through_one_epost(tmp_path, monkeypatch):
+    posts, pages = [], []
+
+    class Resp:
+        content = b"<ePostResult><QueryKey>1</QueryKey><WebEnv>WE</WebEnv></ePostResult>"
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"result": {"uids": []}}
+
+    # The client and the request helpers share one session object.
+    monkeypatch.setattr(pubmed_client.HTTP_SESSION, "post", lambda url, data, timeout: posts.append(data) or Resp())
+    monkeypatch.setattr(pubmed_client.HTTP_SESSION, "get", lambda url, params, timeout: pages.append(params) or Resp())
+    client = _client(tmp_path)
+    client._esummary("pubmed", [str(i) for i in range(450)])
+
+    assert len(posts) == 1
+    assert sorted((p["WebEnv"], p["retstart"], p["retmax"]) for p in pages) == [
+        ("WE", 0, 200), ("WE", 200, 200), ("WE", 400, 50)
+    ]
+
+
+def test_failing_step_a_waits_for_background_requests(tmp_path, monkeypatch):
+    finished = []
+
+    def slow_pmc_leg(query, retmax):
+        time.sleep(0.05)
+        finished.append("pmc")
+        return [], {}
+
+    def esearch(db, term, retmax):
+        if term == client._build_pubmed_query_step_a("omeprazole"):
+            raise RuntimeError("step A failed")
+        time.sleep(0.05)
+        finished.append("step_b")
+        return []
+
+    client = _client(tmp_path)
+    client.config.ncbi_api_key = "key"
+    monkeypatch.setattr(client, "_search_pmc_leg", slow_pmc_leg)
+    monkeypatch.setattr(client, "_esearch", esearch)
+    monkeypatch.setattr(client, "_esearch_is_cached", lambda db, term, retmax: False)
+
+    with pytest.raises(RuntimeError):
+        client.search_sources("omeprazole")
+    assert sorted(finished) == ["pmc", "step_b"]
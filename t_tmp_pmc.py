@@ -1,4 +1,3 @@
-import requests
 from backend.services import pmc_fetcher as pf
 
 xml = """
@@ -30,5 +29,5 @@ class Dummy:
 def _mock_get(url, params=None, timeout=None):
     return Dummy(xml,200)
 
-requests.get = _mock_get
+pf._SESSION.get = _mock_get
 print(pf.fetch_pmc_sections('PMCID:123'))